@@ -6,7 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 from src.config import get_settings
 from src.database import Base
-from src.models.user import User, OTP, RefreshToken
+from src.models.user import User, OTP, RefreshToken, ServiceClient, AuditEvent, RevocationEvent
 
 config = context.config
 
@@ -0,0 +1,28 @@
+"""Add last_sent_at to OTPs
+
+Revision ID: 5e7c0a93b1f2
+Revises: 8d2f4b61a0c9
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7c0a93b1f2'
+down_revision: Union[str, Sequence[str], None] = '8d2f4b61a0c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tbl_otps', sa.Column('last_sent_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tbl_otps', 'last_sent_at')
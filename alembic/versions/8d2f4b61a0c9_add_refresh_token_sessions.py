@@ -0,0 +1,40 @@
+"""Add per-device session columns and active-token partial index
+
+Revision ID: 8d2f4b61a0c9
+Revises: 3c1a9e52d7b4
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b61a0c9'
+down_revision: Union[str, Sequence[str], None] = '3c1a9e52d7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tbl_refresh_tokens', sa.Column('user_agent', sa.String(), nullable=True))
+    op.add_column('tbl_refresh_tokens', sa.Column('ip_address', sa.String(), nullable=True))
+    op.add_column('tbl_refresh_tokens', sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_tbl_refresh_tokens_active_user',
+        'tbl_refresh_tokens',
+        ['user_id', 'expires_at'],
+        unique=False,
+        postgresql_where=sa.text('revoked = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tbl_refresh_tokens_active_user', table_name='tbl_refresh_tokens')
+    op.drop_column('tbl_refresh_tokens', 'last_used_at')
+    op.drop_column('tbl_refresh_tokens', 'ip_address')
+    op.drop_column('tbl_refresh_tokens', 'user_agent')
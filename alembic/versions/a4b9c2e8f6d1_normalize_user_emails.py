@@ -0,0 +1,55 @@
+"""Normalize user emails to lowercase
+
+Revision ID: a4b9c2e8f6d1
+Revises: 5e7c0a93b1f2
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4b9c2e8f6d1'
+down_revision: Union[str, Sequence[str], None] = '5e7c0a93b1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Within each case-insensitive duplicate group, keep one account: prefer
+    # verified, then active, then the oldest. The others are parked under an
+    # unusable address and deactivated rather than deleted, so support can
+    # still merge them by hand.
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY lower(email)
+                       ORDER BY is_verified DESC NULLS LAST, is_active DESC NULLS LAST, id
+                   ) AS rn
+            FROM tbl_users
+        )
+        UPDATE tbl_users u
+        SET email = lower(u.email) || '#duplicate-' || u.id,
+            is_active = false
+        FROM ranked
+        WHERE ranked.id = u.id AND ranked.rn > 1
+    """)
+    op.execute("""
+        UPDATE tbl_refresh_tokens t
+        SET revoked = true
+        FROM tbl_users u
+        WHERE t.user_id = u.id AND u.email LIKE '%#duplicate-%' AND t.revoked = false
+    """)
+    op.execute("UPDATE tbl_users SET email = lower(email) WHERE email <> lower(email)")
+    op.execute("UPDATE tbl_otps SET email = lower(email) WHERE email <> lower(email)")
+    op.create_check_constraint('ck_tbl_users_email_lowercase', 'tbl_users', 'email = lower(email)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_tbl_users_email_lowercase', 'tbl_users', type_='check')
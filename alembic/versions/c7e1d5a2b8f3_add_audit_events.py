@@ -0,0 +1,44 @@
+"""Add partitioned audit events table
+
+Revision ID: c7e1d5a2b8f3
+Revises: a4b9c2e8f6d1
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1d5a2b8f3'
+down_revision: Union[str, Sequence[str], None] = 'a4b9c2e8f6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE tbl_audit_events (
+            id BIGSERIAL NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            event_type VARCHAR NOT NULL,
+            success BOOLEAN NOT NULL,
+            user_id INTEGER,
+            email VARCHAR,
+            ip_address VARCHAR,
+            request_id VARCHAR,
+            details JSON,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE tbl_audit_events_default PARTITION OF tbl_audit_events DEFAULT")
+    op.create_index('ix_tbl_audit_events_user_id_created_at', 'tbl_audit_events', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tbl_audit_events_user_id_created_at', table_name='tbl_audit_events')
+    op.execute("DROP TABLE tbl_audit_events")
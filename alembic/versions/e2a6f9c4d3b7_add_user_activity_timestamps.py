@@ -0,0 +1,30 @@
+"""Add last_login_at and last_seen_at to users
+
+Revision ID: e2a6f9c4d3b7
+Revises: c7e1d5a2b8f3
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6f9c4d3b7'
+down_revision: Union[str, Sequence[str], None] = 'c7e1d5a2b8f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tbl_users', sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tbl_users', sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tbl_users', 'last_seen_at')
+    op.drop_column('tbl_users', 'last_login_at')
@@ -0,0 +1,48 @@
+"""Widen primary keys to BIGINT and drop redundant primary-key indexes
+
+Revision ID: f1c3b7e9a5d2
+Revises: e2a6f9c4d3b7
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3b7e9a5d2'
+down_revision: Union[str, Sequence[str], None] = 'e2a6f9c4d3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The primary-key constraints already carry unique indexes on id.
+    op.drop_index(op.f('ix_tbl_users_id'), table_name='tbl_users')
+    op.drop_index(op.f('ix_tbl_otps_id'), table_name='tbl_otps')
+    op.drop_index(op.f('ix_tbl_refresh_tokens_id'), table_name='tbl_refresh_tokens')
+
+    # BIGINT keys let ID_STRATEGY=snowflake be switched on later. Generated
+    # ids start far above any existing serial value, so old and new rows
+    # coexist. The sequences stay in place for ID_STRATEGY=serial.
+    for table in ('tbl_users', 'tbl_otps', 'tbl_refresh_tokens'):
+        op.alter_column(table, 'id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+        op.execute(f"ALTER SEQUENCE IF EXISTS {table}_id_seq AS bigint")
+    op.alter_column('tbl_refresh_tokens', 'user_id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+    op.alter_column('tbl_audit_events', 'user_id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('tbl_audit_events', 'user_id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=True)
+    op.alter_column('tbl_refresh_tokens', 'user_id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
+    for table in ('tbl_users', 'tbl_otps', 'tbl_refresh_tokens'):
+        op.execute(f"ALTER SEQUENCE IF EXISTS {table}_id_seq AS integer")
+        op.alter_column(table, 'id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
+
+    op.create_index(op.f('ix_tbl_refresh_tokens_id'), 'tbl_refresh_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_tbl_otps_id'), 'tbl_otps', ['id'], unique=False)
+    op.create_index(op.f('ix_tbl_users_id'), 'tbl_users', ['id'], unique=False)
@@ -0,0 +1,79 @@
+import argparse
+import statistics
+import time
+from src.config import get_settings
+from src.utils.security import build_pwd_context
+
+settings = get_settings()
+
+SAMPLE_PASSWORD = "calibration-password-123"
+
+
+def time_hash(context, samples: int) -> float:
+    context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int):
+    best = None
+    for rounds in range(10, 18):
+        elapsed = time_hash(build_pwd_context(["bcrypt"], bcrypt_rounds=rounds), samples)
+        print(f"  bcrypt rounds={rounds:<2} {elapsed:8.1f}ms")
+        if elapsed > target_ms:
+            break
+        best = (rounds, elapsed)
+    return best
+
+
+def calibrate_argon2(target_ms: float, samples: int):
+    best = None
+    for time_cost in range(1, 11):
+        context = build_pwd_context(
+            ["argon2"],
+            argon2_time_cost=time_cost,
+            argon2_memory_cost=settings.ARGON2_MEMORY_COST,
+            argon2_parallelism=settings.ARGON2_PARALLELISM,
+        )
+        elapsed = time_hash(context, samples)
+        print(f"  argon2 time_cost={time_cost:<2} {elapsed:8.1f}ms")
+        if elapsed > target_ms:
+            break
+        best = (time_cost, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommend password hash parameters for this host")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Per-hash latency budget in milliseconds")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per setting")
+    args = parser.parse_args()
+
+    schemes = [s.strip() for s in settings.PASSWORD_HASH_SCHEMES.split(",") if s.strip()]
+    recommendations = []
+
+    print(f"Calibrating for a {args.target_ms:.0f}ms budget ({args.samples} samples per setting)")
+
+    if "bcrypt" in schemes:
+        best = calibrate_bcrypt(args.target_ms, args.samples)
+        if best:
+            recommendations.append(f"BCRYPT_ROUNDS={best[0]}  # ~{best[1]:.0f}ms")
+        else:
+            recommendations.append("BCRYPT_ROUNDS=10  # minimum; exceeds budget on this host")
+
+    if "argon2" in schemes:
+        best = calibrate_argon2(args.target_ms, args.samples)
+        if best:
+            recommendations.append(f"ARGON2_TIME_COST={best[0]}  # ~{best[1]:.0f}ms")
+        else:
+            recommendations.append("ARGON2_TIME_COST=1  # minimum; exceeds budget on this host")
+        recommendations.append(f"ARGON2_MEMORY_COST={settings.ARGON2_MEMORY_COST}")
+        recommendations.append(f"ARGON2_PARALLELISM={settings.ARGON2_PARALLELISM}")
+
+    print("Recommended settings:")
+    for line in recommendations:
+        print(f"  {line}")
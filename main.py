@@ -1,16 +1,44 @@
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from src.routers import auth
+from src.routers import auth, admin, users
+from src.dependencies.auth import require_admin
 from src.utils.response import APIResponse
 from src.config import get_settings
+from src.database import (
+    READ_AFTER_COOKIE,
+    READ_AFTER_HEADER,
+    WriteMarker,
+    parse_read_after,
+    pool_stats,
+    replica_monitor,
+    write_marker_var,
+)
+from src.models.user import id_generator, worker_id_lease
+from src.services.readiness import readiness
+from src.services.google_oauth import google_metadata
+from src.services.audit import audit
+from src.services.activity import activity
+from src.services.revocation_feed import revocation_feed
+from src.services.token_socket import token_socket_server
+from src.utils.http import close_http_client
+from src.utils.metrics import metrics
+from src.utils.logger import configure_logging, get_logger, request_id_var, request_route_var
+from src.utils.loop_monitor import loop_monitor
+from src.utils.tracing import span
+from src.utils.admission import admission
+import asyncio
+import math
 import time
 import uuid
 
 settings = get_settings()
 
+configure_logging()
+logger = get_logger("identity_service")
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="Complete Identity and Authentication Service",
@@ -19,12 +47,77 @@ app = FastAPI(
     redoc_url="/api/redoc",
 )
 
+@app.middleware("http")
+async def admission_control_middleware(request: Request, call_next):
+    if not settings.SHED_ENABLED:
+        return await call_next(request)
+
+    admission_class = admission.get(request.method, request.url.path)
+    if not await admission_class.acquire():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(settings.SHED_RETRY_AFTER_SECONDS)},
+            content=APIResponse.error(
+                user_message="The service is busy. Please try again shortly.",
+                developer_message=f"Request shed by admission control ({admission_class.name})",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                request_ref_id=getattr(request.state, "request_id", None)
+            )
+        )
+
+    try:
+        return await call_next(request)
+    finally:
+        admission_class.release()
+
+
+@app.middleware("http")
+async def read_your_writes_middleware(request: Request, call_next):
+    # The last-write marker travels with the client, so any worker or
+    # instance can route its follow-up reads to the primary.
+    marker = WriteMarker(parse_read_after(
+        request.headers.get(READ_AFTER_HEADER) or request.cookies.get(READ_AFTER_COOKIE)
+    ))
+    token = write_marker_var.set(marker)
+    try:
+        response = await call_next(request)
+    finally:
+        write_marker_var.reset(token)
+
+    if marker.written:
+        window = settings.REPLICA_READ_YOUR_WRITES_SECONDS
+        read_after = f"{time.time() + window:.3f}"
+        response.headers[READ_AFTER_HEADER] = read_after
+        response.set_cookie(
+            READ_AFTER_COOKIE,
+            read_after,
+            max_age=math.ceil(window),
+            httponly=True,
+            samesite="lax"
+        )
+    return response
+
+
 @app.middleware("http")
 async def add_request_id_middleware(request: Request, call_next):
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
+    token = request_id_var.set(request_id)
+    route_token = request_route_var.set(f"{request.method} {request.url.path}")
     
-    response = await call_next(request)
+    try:
+        with span(
+            "http.request",
+            trace_id=request_id,
+            method=request.method,
+            path=request.url.path
+        ) as request_span:
+            response = await call_next(request)
+            if request_span is not None:
+                request_span.set_attribute("status_code", response.status_code)
+    finally:
+        request_id_var.reset(token)
+        request_route_var.reset(route_token)
     response.headers["X-Request-ID"] = request_id
     
     return response
@@ -38,7 +131,10 @@ async def add_process_time_middleware(request: Request, call_next):
     response.headers["X-Process-Time"] = f"{process_time * 1000:.2f}ms"
     
     if process_time > 1.0:
-        print(f"Slow request: {request.method} {request.url.path} took {process_time:.2f}s")
+        logger.warning(
+            "Slow request",
+            extra={"method": request.method, "path": request.url.path, "duration_ms": round(process_time * 1000, 2)}
+        )
     
     return response
 
@@ -52,7 +148,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], 
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Process-Time"],
+    expose_headers=["X-Request-ID", "X-Process-Time", READ_AFTER_HEADER],
 )
 
 @app.exception_handler(RequestValidationError)
@@ -80,7 +176,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
-    print(f"Database Error [{request_id}]: {str(exc)}")
+    logger.error("Database error", exc_info=exc, extra={"request_id": request_id})
     
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -97,9 +193,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 async def general_exception_handler(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
 
-    print(f"Unhandled Error [{request_id}]: {str(exc)}")
-    import traceback
-    traceback.print_exc()
+    logger.error("Unhandled error", exc_info=exc, extra={"request_id": request_id})
     
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -112,6 +206,8 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 app.include_router(auth.router)
+app.include_router(admin.router)
+app.include_router(users.router)
 
 @app.get("/health")
 async def health_check():
@@ -126,6 +222,34 @@ async def health_check():
     )
 
 
+@app.get("/ready")
+async def readiness_check():
+    result = await readiness.get()
+    status_code = status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return JSONResponse(
+        status_code=status_code,
+        content=APIResponse.success(
+            data=result,
+            user_message="Service is ready" if result["ready"] else "Service is not ready",
+            developer_message=f"Readiness status: {result['status']}",
+            status_code=status_code
+        )
+    )
+
+
+@app.get("/metrics", dependencies=[Depends(require_admin)])
+async def metrics_snapshot():
+    return APIResponse.success(
+        data={
+            **metrics.snapshot(),
+            "db_pool": pool_stats(),
+        },
+        user_message="Metrics retrieved",
+        developer_message="Metrics snapshot generated"
+    )
+
+
 @app.get("/")
 async def root():
     return APIResponse.success(
@@ -135,6 +259,7 @@ async def root():
             "documentation": "/api/docs",
             "endpoints": {
                 "health": "/health",
+                "ready": "/ready",
             }
         },
         user_message=f"Welcome to {settings.APP_NAME}",
@@ -142,16 +267,45 @@ async def root():
     )
 @app.on_event("startup")
 async def startup_event():
-    print("Application starting...")
-    print(f"Service: {settings.APP_NAME}")
-    print(f"Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'configured'}")
-    print("Application started successfully")
+    logger.info(
+        "Application starting",
+        extra={
+            "service": settings.APP_NAME,
+            "database": settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'configured'
+        }
+    )
+    if id_generator is not None:
+        logger.info("Snowflake ids enabled", extra={"worker_id": id_generator.worker_id})
+    readiness.start()
+    if replica_monitor is not None:
+        replica_monitor.start()
+    google_metadata.start()
+    audit.start()
+    activity.start()
+    revocation_feed.start()
+    if token_socket_server is not None:
+        await token_socket_server.start()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    logger.info("Application started successfully")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    print("Application shutting down...")
-    print("Cleanup completed")
+    logger.info("Application shutting down")
+    await loop_monitor.stop()
+    await revocation_feed.stop()
+    if token_socket_server is not None:
+        await token_socket_server.stop()
+    await readiness.stop()
+    if replica_monitor is not None:
+        await replica_monitor.stop()
+    await google_metadata.stop()
+    await close_http_client()
+    await asyncio.to_thread(audit.stop)
+    await asyncio.to_thread(activity.stop)
+    worker_id_lease.release()
+    logger.info("Cleanup completed")
 
 if __name__ == "__main__":
     import uvicorn
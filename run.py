@@ -1,15 +1,15 @@
 import uvicorn
 from src.config import get_settings
+from src.utils.logger import configure_logging, get_logger
 
 settings = get_settings()
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print(f"Starting {settings.APP_NAME}")
-    print("=" * 50)
-    print(f"Server: http://localhost:8000")
-    print(f"Docs: http://localhost:8000/api/docs")
-    print("=" * 50)
+    configure_logging()
+    get_logger("identity_service").info(
+        f"Starting {settings.APP_NAME}",
+        extra={"server": "http://localhost:8000", "docs": "http://localhost:8000/api/docs"}
+    )
     
     uvicorn.run(
         "main:app",
@@ -1,15 +1,55 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
 
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+    DB_APPLICATION_NAME: Optional[str] = None
+    ID_STRATEGY: str = "serial"
+    ID_WORKER_ID: Optional[int] = None
+    REPLICA_DATABASE_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 2.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5.0
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 10.0
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    ME_CACHE_MAX_AGE_SECONDS: int = 15
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    USER_BATCH_MAX_ITEMS: int = 500
+    USER_DIRECTORY_CACHE_MAX_ENTRIES: int = 20000
+    USER_DIRECTORY_CACHE_TTL_SECONDS: float = 60.0
+    TOKEN_VERIFY_SOCKET_PATH: Optional[str] = None
+    TOKEN_VERIFY_SOCKET_MODE: int = 0o660
+    REVOCATION_FEED_POLL_SECONDS: float = 1.0
+    REVOCATION_FEED_HEARTBEAT_SECONDS: float = 15.0
+    REVOCATION_EVENT_RETENTION_HOURS: int = 48
+    SERVICE_TOKEN_EXPIRE_MINUTES: int = 10
+    ADMIN_API_KEY: Optional[str] = None
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_SECONDS: float = 60.0
+    PROFILER_MAX_RATE_HZ: float = 250.0
     OTP_EXPIRE_MINUTES: int = 10
+    OTP_STORE_BACKEND: str = "sql"
+    OTP_STORE_URL: Optional[str] = None
+    OTP_RESEND_COOLDOWN_SECONDS: int = 60
+    OTP_REUSE_WINDOW_SECONDS: int = 300
+    MAGIC_LINK_FLOWS: str = ""
+    MAGIC_LINK_EXPIRE_MINUTES: int = 15
+    PASSWORD_HASH_SCHEMES: str = "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
     SMTP_HOST: str
     SMTP_PORT: int
     SMTP_USERNAME: str
@@ -19,7 +59,37 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str
+    GOOGLE_DISCOVERY_URL: str = "https://accounts.google.com/.well-known/openid-configuration"
+    GOOGLE_METADATA_TTL_SECONDS: float = 3600.0
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20
     APP_NAME: str = "Identity Service"
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 30.0
+    AUDIT_BUFFER_SIZE: int = 50000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    LOG_LEVEL: str = "INFO"
+    SHED_ENABLED: bool = True
+    SHED_EXPENSIVE_MAX_IN_FLIGHT: int = 16
+    SHED_EXPENSIVE_MAX_QUEUE: int = 64
+    SHED_EXPENSIVE_MAX_WAIT_MS: int = 1000
+    SHED_EXPENSIVE_TARGET_WAIT_MS: int = 100
+    SHED_INTERVAL_MS: int = 500
+    SHED_RETRY_AFTER_SECONDS: int = 2
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_LAG_THRESHOLD_MS: float = 200.0
+    TRACING_ENABLED: bool = True
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = "spans.jsonl"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_ERROR_SAMPLE_WINDOW_SECONDS: float = 60.0
+    LOG_ERROR_SAMPLE_BURST: int = 5
+    READINESS_REFRESH_SECONDS: float = 5.0
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0
+    READINESS_REQUIRE_SMTP: bool = False
+    READINESS_POOL_SATURATION_THRESHOLD: float = 0.9
     FRONTEND_URL: str
 
     class Config:
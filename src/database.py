@@ -1,20 +1,240 @@
-from sqlalchemy import create_engine
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from src.config import get_settings
+from src.utils.metrics import metrics
+from src.utils.tracing import instrument_engine
 
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL)
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.incr("db.pool.checkout_timeouts")
+            raise
+        finally:
+            metrics.observe("db.pool.checkout_wait_ms", (time.perf_counter() - start) * 1000)
+
+
+def build_connect_args(database_url: str) -> dict:
+    if not database_url.startswith("postgres"):
+        return {}
+
+    return {
+        "application_name": settings.DB_APPLICATION_NAME or settings.APP_NAME,
+        "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}",
+    }
+
+
+def build_engine(database_url: str):
+    new_engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=build_connect_args(database_url),
+    )
+    instrument_engine(new_engine)
+    return new_engine
+
+
+engine = build_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engine = build_engine(settings.REPLICA_DATABASE_URL) if settings.REPLICA_DATABASE_URL else None
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None else None
+)
+
 Base = declarative_base()
 
 
+def pool_stats(target_engine=engine) -> dict:
+    pool = target_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
+metrics.register_gauge("db.pool.size", lambda: engine.pool.size())
+metrics.register_gauge("db.pool.checked_out", lambda: engine.pool.checkedout())
+metrics.register_gauge("db.pool.overflow", lambda: engine.pool.overflow())
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+class WriteMarker:
+    def __init__(self, read_after: float = 0.0):
+        self.read_after = read_after
+        self.written = False
+
+
+READ_AFTER_HEADER = "X-Read-After"
+READ_AFTER_COOKIE = "read_after"
+
+# One marker per request. The object is shared by the contexts copied into
+# threadpool calls, so writes recorded there are visible to the middleware.
+write_marker_var: ContextVar[Optional[WriteMarker]] = ContextVar("write_marker", default=None)
+
+
+def parse_read_after(value: Optional[str]) -> float:
+    try:
+        read_after = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    # A client can only pin itself to the primary for one window at a time.
+    if read_after > time.time() + settings.REPLICA_READ_YOUR_WRITES_SECONDS:
+        return 0.0
+    return read_after
+
+
+class ReplicaLagMonitor:
+    def __init__(self, replica, max_lag_seconds: float, check_interval_seconds: float):
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds: Optional[float] = None
+        self._healthy = False
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _measure(self) -> Optional[float]:
+        if self.replica.dialect.name != "postgresql":
+            return 0.0
+
+        with self.replica.connect() as conn:
+            lag = conn.execute(text(
+                "SELECT CASE WHEN pg_is_in_recovery() "
+                "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "ELSE 0 END"
+            )).scalar()
+        return float(lag) if lag is not None else None
+
+    async def refresh(self) -> bool:
+        try:
+            self.lag_seconds = await asyncio.wait_for(
+                asyncio.to_thread(self._measure),
+                max(self.check_interval_seconds, 1.0)
+            )
+            self._healthy = self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+        except Exception:
+            self.lag_seconds = None
+            self._healthy = False
+
+        if not self._healthy:
+            metrics.incr("db.replica.lag_fallbacks")
+        self._checked_at = time.monotonic()
+        return self._healthy
+
+    def is_healthy(self) -> bool:
+        # Only reads the flag kept fresh by the background task; a stale
+        # result (task stopped or stuck) routes reads to the primary.
+        age = time.monotonic() - self._checked_at
+        return self._healthy and age <= self.check_interval_seconds * 3
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.check_interval_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+replica_monitor = (
+    ReplicaLagMonitor(
+        replica_engine,
+        settings.REPLICA_MAX_LAG_SECONDS,
+        settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    )
+    if replica_engine is not None else None
+)
+
+if replica_monitor is not None:
+    metrics.register_gauge("db.replica.lag_seconds", lambda: replica_monitor.lag_seconds)
+
+
+def record_write():
+    marker = write_marker_var.get()
+    if marker is not None:
+        marker.written = True
+
+
+class ReadSessions:
+    def __init__(self):
+        self._primary: Optional[Session] = None
+        self._replica: Optional[Session] = None
+
+    def _use_primary(self) -> bool:
+        if ReplicaSessionLocal is None:
+            return True
+        marker = write_marker_var.get()
+        if marker is not None and (marker.written or marker.read_after > time.time()):
+            return True
+        return not replica_monitor.is_healthy()
+
+    def factory(self) -> sessionmaker:
+        if self._use_primary():
+            metrics.incr("db.reads.primary")
+            return SessionLocal
+
+        metrics.incr("db.reads.replica")
+        return ReplicaSessionLocal
+
+    def session(self) -> Session:
+        if self.factory() is SessionLocal:
+            if self._primary is None:
+                self._primary = SessionLocal()
+            return self._primary
+
+        if self._replica is None:
+            self._replica = ReplicaSessionLocal()
+        return self._replica
+
+    def close(self):
+        for db in (self._primary, self._replica):
+            if db is not None:
+                db.close()
+
+
+def get_read_db():
+    reads = ReadSessions()
+    try:
+        yield reads
+    finally:
+        reads.close()
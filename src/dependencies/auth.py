@@ -1,20 +1,39 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from src.database import get_db
+from sqlalchemy.orm import sessionmaker
+from src.database import get_read_db, ReadSessions
 from src.models.user import User
-from src.utils.security import decode_token
+from src.utils.security import decode_token, decode_token_cached
+from src.utils.singleflight import SingleFlight
+from src.utils.metrics import metrics
+from src.services.activity import activity
+from src.config import get_settings
+
+settings = get_settings()
 
 security = HTTPBearer()
+user_lookups = SingleFlight("user_lookup")
+metrics.register_gauge("singleflight.user_lookup.in_flight", user_lookups.in_flight)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    
-    payload = decode_token(token)
+def _load_user(session_factory: sessionmaker, user_id: int):
+    # Owns its session: a coalesced lookup can outlive the request that started it.
+    db = session_factory()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is not None:
+            # Detached so concurrent requests can share the loaded row read-only.
+            db.expunge(user)
+        return user
+    finally:
+        db.close()
+
+
+async def resolve_token_user(token: str, reads: ReadSessions):
+    payload = decode_token_cached(token)
     
     if not payload:
         raise HTTPException(
@@ -38,7 +57,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user_id = int(user_id)
+    session_factory = reads.factory()
+    user = await user_lookups.do(
+        (user_id, id(session_factory)),
+        lambda: run_in_threadpool(_load_user, session_factory, user_id)
+    )
     
     if not user:
         raise HTTPException(
@@ -46,12 +70,24 @@ async def get_current_user(
             detail="User not found"
         )
     
+    return payload, user
+
+
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    reads: ReadSessions = Depends(get_read_db)
+) -> User:
+    payload, user = await resolve_token_user(credentials.credentials, reads)
+    request.state.token_payload = payload
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
     
+    activity.record_seen(user.id)
     return user
 
 
@@ -65,4 +101,57 @@ async def get_current_verified_user(
             detail="Email verification required"
         )
     
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_current_service_client(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    payload = decode_token(credentials.credentials)
+
+    if not payload or payload.get("type") != "service" or not payload.get("client_id"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired service token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return {
+        "client_id": payload["client_id"],
+        "scopes": payload.get("scope", "").split(),
+    }
+
+
+def require_scope(scope: str):
+    async def dependency(
+        service_client: dict = Depends(get_current_service_client)
+    ) -> dict:
+        if scope not in service_client["scopes"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing required scope: {scope}"
+            )
+        return service_client
+
+    return dependency
+
+
+async def require_admin(
+    x_admin_key: Optional[str] = Header(None)
+):
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found"
+        )
+
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+
+def get_current_session_id(request: Request) -> Optional[int]:
+    payload = getattr(request.state, "token_payload", None) or {}
+    return payload.get("sid")
@@ -1,8 +1,32 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Enum, Index, CheckConstraint, JSON, Sequence, text
 from sqlalchemy.sql import func
-from src.database import Base
+from src.database import Base, engine
+from src.utils.ids import LazySnowflakeGenerator, WorkerIdLease
+from src.config import get_settings
 import enum
 
+settings = get_settings()
+
+worker_id_lease = WorkerIdLease(engine)
+
+
+def resolve_worker_id() -> int:
+    if settings.ID_WORKER_ID is not None:
+        return settings.ID_WORKER_ID
+    if engine.dialect.name != "postgresql":
+        raise RuntimeError("ID_WORKER_ID must be set when ID_STRATEGY=snowflake and the database cannot lease worker ids")
+    return worker_id_lease.acquire()
+
+
+if settings.ID_STRATEGY == "snowflake":
+    id_generator = LazySnowflakeGenerator(resolve_worker_id)
+    id_default = id_generator.next_id
+else:
+    id_generator = None
+    id_default = None
+
+IdType = BigInteger().with_variant(Integer, "sqlite")
+
 
 class AuthProvider(str, enum.Enum):
     LOCAL = "local"
@@ -11,8 +35,11 @@ class AuthProvider(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "tbl_users"
+    __table_args__ = (
+        CheckConstraint("email = lower(email)", name="ck_tbl_users_email_lowercase"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(IdType, primary_key=True, default=id_default)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=True)
     full_name = Column(String, nullable=True)
@@ -22,24 +49,79 @@ class User(Base):
     google_id = Column(String, unique=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
 
 class OTP(Base):
     __tablename__ = "tbl_otps"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(IdType, primary_key=True, default=id_default)
     email = Column(String, index=True, nullable=False)
     otp_code = Column(String, nullable=False)
     otp_type = Column(String, nullable=False)
     is_used = Column(Boolean, default=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_sent_at = Column(DateTime(timezone=True), nullable=True)
 
 class RefreshToken(Base):
     __tablename__ = "tbl_refresh_tokens"
+    __table_args__ = (
+        Index(
+            "ix_tbl_refresh_tokens_active_user",
+            "user_id",
+            "expires_at",
+            postgresql_where=text("revoked = false"),
+            sqlite_where=text("revoked = 0"),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, nullable=False, index=True)
+    id = Column(IdType, primary_key=True, default=id_default)
+    user_id = Column(IdType, nullable=False, index=True)
     token = Column(String, unique=True, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    revoked = Column(Boolean, default=False)
\ No newline at end of file
+    revoked = Column(Boolean, default=False)
+    user_agent = Column(String, nullable=True)
+    ip_address = Column(String, nullable=True)
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+
+class ServiceClient(Base):
+    __tablename__ = "tbl_service_clients"
+
+    id = Column(Integer, primary_key=True)
+    client_id = Column(String, unique=True, index=True, nullable=False)
+    secret_hash = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    scopes = Column(String, nullable=False, default="")
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class AuditEvent(Base):
+    __tablename__ = "tbl_audit_events"
+    __table_args__ = (
+        Index("ix_tbl_audit_events_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # Composite keys cannot autoincrement on SQLite; there the writer assigns ids.
+    id = Column(IdType, Sequence("tbl_audit_events_id_seq"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    event_type = Column(String, nullable=False)
+    success = Column(Boolean, nullable=False, default=True)
+    user_id = Column(IdType, nullable=True)
+    email = Column(String, nullable=True)
+    ip_address = Column(String, nullable=True)
+    request_id = Column(String, nullable=True)
+    details = Column(JSON, nullable=True)
+
+
+class RevocationEvent(Base):
+    __tablename__ = "tbl_revocation_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(IdType, nullable=False)
+    session_id = Column(IdType, nullable=True)
+    reason = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
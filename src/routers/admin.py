@@ -0,0 +1,77 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from src.database import get_read_db, ReadSessions
+from src.dependencies.auth import require_admin
+from src.services.activity import activity
+from src.utils.profiler import ProfilerBusyError, collapse, sample_stacks
+from src.utils.ids import external_id
+from src.utils.response import APIResponse
+from src.config import get_settings
+
+settings = get_settings()
+
+router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(10.0, gt=0),
+    rate: float = Query(100.0, gt=0)
+):
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    seconds = min(seconds, settings.PROFILER_MAX_SECONDS)
+    rate = min(rate, settings.PROFILER_MAX_RATE_HZ)
+
+    try:
+        stacks = await asyncio.to_thread(sample_stacks, seconds, rate)
+    except ProfilerBusyError as e:
+        return APIResponse.error(
+            user_message="A profile is already running",
+            developer_message=str(e),
+            status_code=status.HTTP_409_CONFLICT
+        )
+
+    return PlainTextResponse(
+        collapse(stacks),
+        headers={"X-Profile-Seconds": str(seconds), "X-Profile-Rate": str(rate)}
+    )
+
+
+@router.get("/users/activity")
+async def user_activity(
+    seen_within_minutes: Optional[int] = Query(None, gt=0),
+    inactive_for_days: Optional[int] = Query(None, gt=0),
+    limit: int = Query(100, gt=0, le=1000),
+    reads: ReadSessions = Depends(get_read_db)
+):
+    users = activity.query_users(
+        reads.session(),
+        seen_within_minutes=seen_within_minutes,
+        inactive_for_days=inactive_for_days,
+        limit=limit
+    )
+
+    return APIResponse.success(
+        data={
+            "users": [
+                {
+                    "id": external_id(user.id),
+                    "email": user.email,
+                    "last_login_at": user.last_login_at,
+                    "last_seen_at": user.last_seen_at
+                }
+                for user in users
+            ],
+            "staleness_seconds": settings.ACTIVITY_FLUSH_INTERVAL_SECONDS
+        },
+        user_message="User activity retrieved",
+        developer_message="Activity timestamps are write-behind and may lag by up to staleness_seconds"
+    )
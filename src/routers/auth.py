@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import secrets
+from urllib.parse import urlencode
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from src.database import get_db
+from src.database import get_db, get_read_db, ReadSessions
 from src.schemas.auth import (
     UserRegister, UserLogin, VerifyOTP, ForgotPassword, 
-    ResetPassword, TokenResponse, UserResponse, RefreshTokenRequest
+    ResetPassword, TokenResponse, UserResponse, RefreshTokenRequest,
+    ClientCredentialsRequest, ServiceClientCreate, VerifyMagicLink,
+    ResetPasswordMagicLink, normalize_email
 )
 from src.services.auth import AuthService
-# from src.services.google_oauth import GoogleOAuthService, oauth
-from src.utils.response import APIResponse
-from src.dependencies.auth import get_current_user, get_current_verified_user
+from src.services.service_client import ServiceClientService
+from src.services.google_oauth import GoogleOAuthService
+from src.services.revocation_feed import revocation_feed
+from src.utils.response import APIResponse, weak_etag, etag_matches
+from src.dependencies.auth import (
+    get_current_user, get_current_verified_user, get_current_session_id,
+    require_admin, require_scope
+)
 from src.models.user import User
+from src.utils.ids import external_id
 from src.config import get_settings
 
 settings = get_settings()
@@ -30,7 +43,7 @@ async def register(
         
         return APIResponse.success(
             data={
-                "user_id": user.id,
+                "user_id": external_id(user.id),
                 "email": user.email,
                 "message": "Registration successful. Please check your email for verification code."
             },
@@ -77,13 +90,40 @@ async def verify_email(
         )
 
 
+@router.post("/verify-email/magic")
+async def verify_email_magic(
+    verification_data: VerifyMagicLink,
+    db: Session = Depends(get_db)
+):
+    try:
+        user = await AuthService.verify_email_magic(db, verification_data.token)
+        
+        return APIResponse.success(
+            data={"email": user.email, "is_verified": user.is_verified},
+            user_message="Email verified successfully!",
+            developer_message="Email verification completed via magic link"
+        )
+    except HTTPException as e:
+        return APIResponse.error(
+            user_message=e.detail,
+            developer_message=e.detail,
+            status_code=e.status_code
+        )
+
+
 @router.post("/resend-verification")
 async def resend_verification(
     email: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    reads: ReadSessions = Depends(get_read_db)
 ):
     try:
-        result = await AuthService.resend_verification_otp(db, email)
+        email = normalize_email(email)
+        result = await AuthService.resend_verification_otp(
+            db,
+            email,
+            read_db=reads.session()
+        )
         return APIResponse.success(
             data=result,
             user_message="Verification code sent!",
@@ -100,10 +140,17 @@ async def resend_verification(
 @router.post("/login")
 async def login(
     login_data: UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     try:
-        result = AuthService.login_user(db, login_data)
+        result = await run_in_threadpool(
+            AuthService.login_user,
+            db,
+            login_data,
+            user_agent=request.headers.get("user-agent"),
+            ip_address=request.client.host if request.client else None
+        )
         
         return APIResponse.success(
             data={
@@ -111,7 +158,7 @@ async def login(
                 "refresh_token": result["refresh_token"],
                 "token_type": "bearer",
                 "user": {
-                    "id": result["user"].id,
+                    "id": external_id(result["user"].id),
                     "email": result["user"].email,
                     "full_name": result["user"].full_name,
                     "is_verified": result["user"].is_verified
@@ -149,13 +196,84 @@ async def refresh_token(
         )
 
 
+@router.post("/reset-password/magic")
+async def reset_password_magic(
+    reset_data: ResetPasswordMagicLink,
+    db: Session = Depends(get_db)
+):
+    try:
+        user = await AuthService.reset_password_magic(
+            db,
+            reset_data.token,
+            reset_data.new_password
+        )
+        
+        return APIResponse.success(
+            data={"email": user.email},
+            user_message="Password reset successful! Please login with your new password.",
+            developer_message="Password updated via magic link and sessions revoked"
+        )
+    except HTTPException as e:
+        return APIResponse.error(
+            user_message=e.detail,
+            developer_message=e.detail,
+            status_code=e.status_code
+        )
+
+
+@router.post("/token")
+async def client_credentials_token(
+    token_data: ClientCredentialsRequest,
+    db: Session = Depends(get_db)
+):
+    try:
+        result = ServiceClientService.issue_token(
+            db,
+            token_data.client_id,
+            token_data.client_secret,
+            token_data.scope
+        )
+
+        return APIResponse.success(
+            data=result,
+            user_message="Token issued",
+            developer_message="Service access token issued via client credentials"
+        )
+    except HTTPException as e:
+        return APIResponse.error(
+            user_message=e.detail,
+            developer_message=e.detail,
+            status_code=e.status_code
+        )
+
+
+@router.post("/clients", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
+async def register_service_client(
+    client_data: ServiceClientCreate,
+    db: Session = Depends(get_db)
+):
+    result = ServiceClientService.register_client(db, client_data.name, client_data.scopes)
+
+    return APIResponse.success(
+        data=result,
+        user_message="Service client registered. Store the secret now; it cannot be retrieved again.",
+        developer_message="Service client created",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
 @router.post("/forgot-password")
 async def forgot_password(
     data: ForgotPassword,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    reads: ReadSessions = Depends(get_read_db)
 ):
     try:
-        result = await AuthService.forgot_password(db, data.email)
+        result = await AuthService.forgot_password(
+            db,
+            data.email,
+            read_db=reads.session()
+        )
         
         return APIResponse.success(
             data=result,
@@ -195,66 +313,115 @@ async def reset_password(
             status_code=e.status_code
         )
 
-# @router.get("/google/login")
-# async def google_login():
-#     try:
-#         redirect_uri = settings.GOOGLE_REDIRECT_URI
-#         authorization_url = await oauth.google.authorize_redirect(
-#             redirect_uri=redirect_uri
-#         )
-#         return authorization_url
+GOOGLE_STATE_COOKIE = "google_oauth_state"
+
+
+@router.get("/google/login")
+async def google_login():
+    try:
+        oauth_state = GoogleOAuthService.generate_state()
+        authorization_url = await GoogleOAuthService.get_authorization_url(
+            oauth_state["state"],
+            oauth_state["nonce"]
+        )
+
+        response = RedirectResponse(url=authorization_url)
+        response.set_cookie(
+            GOOGLE_STATE_COOKIE,
+            f"{oauth_state['state']}.{oauth_state['nonce']}",
+            max_age=600,
+            httponly=True,
+            secure=settings.GOOGLE_REDIRECT_URI.startswith("https"),
+            samesite="lax"
+        )
+        return response
         
-#     except Exception as e:
-#         return APIResponse.error(
-#             user_message="Google login unavailable. Please try again.",
-#             developer_message=str(e),
-#             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-#         )
-
-
-# @router.get("/google/callback")
-# async def google_callback(
-#     request: Request,
-#     db: Session = Depends(get_db)
-# ):
-#     try:
-#         token = await oauth.google.authorize_access_token(request)
-#         result = await GoogleOAuthService.handle_callback(db, token)
+    except Exception as e:
+        return APIResponse.error(
+            user_message="Google login unavailable. Please try again.",
+            developer_message=str(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.get("/google/callback")
+async def google_callback(
+    request: Request,
+    code: str = None,
+    state: str = None,
+    db: Session = Depends(get_db)
+):
+    try:
+        stored_state, _, nonce = (request.cookies.get(GOOGLE_STATE_COOKIE) or "").partition(".")
+        if not code or not state or not stored_state or not secrets.compare_digest(state, stored_state):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid OAuth state"
+            )
+
+        result = await GoogleOAuthService.handle_callback(
+            db,
+            code,
+            nonce,
+            user_agent=request.headers.get("user-agent"),
+            ip_address=request.client.host if request.client else None
+        )
     
-#         frontend_url = f"{settings.FRONTEND_URL}/auth/callback"
-#         redirect_url = (
-#             f"{frontend_url}"
-#             f"?access_token={result['access_token']}"
-#             f"&refresh_token={result['refresh_token']}"
-#             f"&user_id={result['user'].id}"
-#         )
+        frontend_url = f"{settings.FRONTEND_URL}/auth/callback"
+        redirect_url = (
+            f"{frontend_url}"
+            f"?access_token={result['access_token']}"
+            f"&refresh_token={result['refresh_token']}"
+            f"&user_id={result['user'].id}"
+        )
         
-#         from fastapi.responses import RedirectResponse
-#         return RedirectResponse(url=redirect_url)
+        response = RedirectResponse(url=redirect_url)
         
-#     except Exception as e:
-#         error_url = f"{settings.FRONTEND_URL}/auth/error?message={str(e)}"
-#         from fastapi.responses import RedirectResponse
-#         return RedirectResponse(url=error_url)
+    except Exception as e:
+        message = e.detail if isinstance(e, HTTPException) else "Google login failed"
+        error_url = f"{settings.FRONTEND_URL}/auth/error?{urlencode({'message': message})}"
+        response = RedirectResponse(url=error_url)
+
+    response.delete_cookie(GOOGLE_STATE_COOKIE)
+    return response
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     try:
-      return APIResponse.success(
-        data={
-            "id": current_user.id,
-            "email": current_user.email,
-            "full_name": current_user.full_name,
-            "is_active": current_user.is_active,
-            "is_verified": current_user.is_verified,
-            "auth_provider": current_user.auth_provider.value,
-            "created_at": current_user.created_at
-        },
-        user_message="User information retrieved",
-        developer_message="Current user data fetched successfully"
-    )
+      etag = weak_etag(
+          current_user.id,
+          (current_user.updated_at or current_user.created_at).isoformat(),
+          current_user.is_verified,
+          current_user.is_active
+      )
+      cache_headers = {
+          "ETag": etag,
+          "Cache-Control": f"private, max-age={settings.ME_CACHE_MAX_AGE_SECONDS}",
+          "Vary": "Authorization",
+      }
+
+      if etag_matches(request.headers.get("if-none-match"), etag):
+          return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+      return JSONResponse(
+        content=jsonable_encoder(APIResponse.success(
+            data={
+                "id": external_id(current_user.id),
+                "email": current_user.email,
+                "full_name": current_user.full_name,
+                "is_active": current_user.is_active,
+                "is_verified": current_user.is_verified,
+                "auth_provider": current_user.auth_provider.value,
+                "created_at": current_user.created_at
+            },
+            user_message="User information retrieved",
+            developer_message="Current user data fetched successfully"
+        )),
+        headers=cache_headers
+      )
     except HTTPException as e:
         return APIResponse.error(
             user_message="Not authenticated",
@@ -263,24 +430,108 @@ async def get_current_user_info(
         )
 
 
+@router.get("/revocations/stream")
+async def revocation_stream(
+    request: Request,
+    since: int = None,
+    service_client: dict = Depends(require_scope("revocations:read"))
+):
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    return StreamingResponse(
+        revocation_feed.stream(request, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/sessions")
+async def list_sessions(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    current_session_id = get_current_session_id(request)
+    sessions = AuthService.list_sessions(db, current_user.id)
+
+    return APIResponse.success(
+        data={
+            "sessions": [
+                {
+                    "id": external_id(session.id),
+                    "user_agent": session.user_agent,
+                    "ip_address": session.ip_address,
+                    "created_at": session.created_at,
+                    "last_used_at": session.last_used_at,
+                    "expires_at": session.expires_at,
+                    "current": session.id == current_session_id
+                }
+                for session in sessions
+            ]
+        },
+        user_message="Active sessions retrieved",
+        developer_message="Active refresh-token sessions listed"
+    )
+
+
+@router.delete("/sessions/{session_id}")
+async def revoke_session(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        AuthService.revoke_session(db, current_user.id, session_id)
+
+        return APIResponse.success(
+            data={"session_id": session_id},
+            user_message="Session signed out",
+            developer_message="Refresh token revoked for session"
+        )
+    except HTTPException as e:
+        return APIResponse.error(
+            user_message=e.detail,
+            developer_message=e.detail,
+            status_code=e.status_code
+        )
+
+
 @router.post("/logout")
 async def logout(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
-        from src.models.user import RefreshToken
-
-        db.query(RefreshToken).filter(
-            RefreshToken.user_id == current_user.id,
-            RefreshToken.revoked == False
-        ).update({"revoked": True})
-        
-        db.commit()
+        session_id = get_current_session_id(request)
+        AuthService.logout(db, current_user.id, session_id)
         
         return APIResponse.success(
             data={"message": "Logged out successfully"},
             user_message="You've been logged out",
+            developer_message="Current session revoked" if session_id else "All refresh tokens revoked"
+        )
+    except Exception as e:
+        return APIResponse.error(
+            user_message="Logout failed",
+            developer_message=str(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.post("/logout-all")
+async def logout_all(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        AuthService.logout(db, current_user.id)
+
+        return APIResponse.success(
+            data={"message": "Logged out of all sessions"},
+            user_message="You've been logged out everywhere",
             developer_message="All refresh tokens revoked"
         )
     except Exception as e:
@@ -288,4 +539,4 @@ async def logout(
             user_message="Logout failed",
             developer_message=str(e),
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
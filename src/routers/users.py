@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from src.database import get_read_db, ReadSessions
+from src.dependencies.auth import require_scope
+from src.schemas.auth import UserBatchLookup
+from src.services.user_directory import user_directory
+from src.utils.response import APIResponse
+
+router = APIRouter(
+    prefix="/api/v1/users",
+    tags=["Users"]
+)
+
+
+@router.post("/batch")
+async def batch_lookup(
+    lookup: UserBatchLookup,
+    service_client: dict = Depends(require_scope("users:read")),
+    reads: ReadSessions = Depends(get_read_db)
+):
+    users, missing_ids, missing_emails = user_directory.lookup(reads.session(), lookup.ids, lookup.emails)
+
+    return APIResponse.success(
+        data={
+            "users": users,
+            "missing": {"ids": missing_ids, "emails": missing_emails}
+        },
+        user_message="Users retrieved",
+        developer_message=f"Resolved {len(users)} users; {len(missing_ids) + len(missing_emails)} not found"
+    )
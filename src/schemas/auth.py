@@ -1,34 +1,54 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, model_validator
+from pydantic_core import PydanticCustomError
+from typing import Annotated, List, Literal, Optional
 from datetime import datetime
+from src.config import get_settings
+
+settings = get_settings()
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+NormalizedEmail = Annotated[EmailStr, AfterValidator(normalize_email)]
 
 
 class UserRegister(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     password: str = Field(..., min_length=8)
     full_name: Optional[str] = None
 
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     password: str
 
 
 class VerifyOTP(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     otp_code: str = Field(..., min_length=6, max_length=6)
 
 
 class ForgotPassword(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
 
 
 class ResetPassword(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     otp_code: str = Field(..., min_length=6, max_length=6)
     new_password: str = Field(..., min_length=8)
 
 
+class VerifyMagicLink(BaseModel):
+    token: str
+
+
+class ResetPasswordMagicLink(BaseModel):
+    token: str
+    new_password: str = Field(..., min_length=8)
+
+
 class TokenResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -49,4 +69,34 @@ class UserResponse(BaseModel):
 
 
 class RefreshTokenRequest(BaseModel):
-    refresh_token: str
\ No newline at end of file
+    refresh_token: str
+
+
+class ClientCredentialsRequest(BaseModel):
+    grant_type: Literal["client_credentials"]
+    client_id: str
+    client_secret: str
+    scope: Optional[str] = None
+
+
+class ServiceClientCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    scopes: List[str] = []
+
+
+class UserBatchLookup(BaseModel):
+    ids: List[int] = []
+    emails: List[NormalizedEmail] = []
+
+    @model_validator(mode="after")
+    def check_size(self):
+        total = len(self.ids) + len(self.emails)
+        if total == 0:
+            raise PydanticCustomError("batch_empty", "Provide at least one id or email")
+        if total > settings.USER_BATCH_MAX_ITEMS:
+            raise PydanticCustomError(
+                "batch_too_large",
+                "At most {limit} ids and emails per request",
+                {"limit": settings.USER_BATCH_MAX_ITEMS}
+            )
+        return self
@@ -0,0 +1,125 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.config import get_settings
+from src.database import engine
+from src.models.user import User
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+class ActivityTracker:
+    def __init__(self, flush_interval_seconds: float, batch_size: int = 1000):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self._pending: Dict[int, Tuple[Optional[datetime], Optional[datetime]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _touch(self, user_id: int, login: bool):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            last_login, _ = self._pending.get(user_id, (None, None))
+            self._pending[user_id] = (now if login else last_login, now)
+
+    def record_login(self, user_id: int):
+        self._touch(user_id, login=True)
+
+    def record_seen(self, user_id: int):
+        self._touch(user_id, login=False)
+
+    def _write(self, rows: List[tuple]):
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                params = {}
+                values = []
+                for i, (user_id, last_login, last_seen) in enumerate(rows):
+                    values.append(f"(:id{i}, CAST(:login{i} AS timestamptz), CAST(:seen{i} AS timestamptz))")
+                    params.update({f"id{i}": user_id, f"login{i}": last_login, f"seen{i}": last_seen})
+
+                conn.execute(text(
+                    "UPDATE tbl_users AS u SET "
+                    "last_login_at = GREATEST(u.last_login_at, v.last_login_at), "
+                    "last_seen_at = GREATEST(u.last_seen_at, v.last_seen_at) "
+                    f"FROM (VALUES {', '.join(values)}) AS v(id, last_login_at, last_seen_at) "
+                    "WHERE u.id = v.id"
+                ), params)
+            else:
+                conn.execute(text(
+                    "UPDATE tbl_users SET "
+                    "last_login_at = COALESCE(:last_login, last_login_at), "
+                    "last_seen_at = :last_seen "
+                    "WHERE id = :id"
+                ), [
+                    {"id": user_id, "last_login": last_login, "last_seen": last_seen}
+                    for user_id, last_login, last_seen in rows
+                ])
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        rows = [(user_id, login, seen) for user_id, (login, seen) in pending.items()]
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                self._write(batch)
+            except Exception as e:
+                metrics.incr("activity.flush_errors")
+                logger.error("Activity flush failed", exc_info=e, extra={"batch_size": len(batch)})
+                with self._lock:
+                    for user_id, login, seen in rows[start:]:
+                        self._pending.setdefault(user_id, (login, seen))
+                return start
+
+        metrics.incr("activity.users_flushed", len(rows))
+        return len(rows)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @staticmethod
+    def query_users(
+        db: Session,
+        seen_within_minutes: Optional[int] = None,
+        inactive_for_days: Optional[int] = None,
+        limit: int = 100
+    ) -> List[User]:
+        now = datetime.now(timezone.utc)
+        query = db.query(User)
+
+        if seen_within_minutes is not None:
+            query = query.filter(User.last_seen_at >= now - timedelta(minutes=seen_within_minutes))
+        if inactive_for_days is not None:
+            query = query.filter(
+                (User.last_seen_at == None) | (User.last_seen_at < now - timedelta(days=inactive_for_days))
+            )
+
+        return query.order_by(User.last_seen_at.desc().nullslast()).limit(limit).all()
+
+
+activity = ActivityTracker(settings.ACTIVITY_FLUSH_INTERVAL_SECONDS)
+metrics.register_gauge("activity.pending_users", activity.pending)
@@ -0,0 +1,159 @@
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import func, insert, select, text
+from src.config import get_settings
+from src.database import engine
+from src.models.user import AuditEvent
+from src.utils.logger import get_logger, request_id_var
+from src.utils.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+class AuditWriter:
+    def __init__(self, buffer_size: int, batch_size: int, flush_interval_seconds: float):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._buffer = deque(maxlen=buffer_size)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._partitioned_through: Optional[datetime] = None
+        self._next_id: Optional[int] = None
+        self._failures = 0
+
+    def record(
+        self,
+        event_type: str,
+        success: bool = True,
+        user_id: Optional[int] = None,
+        email: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        **details
+    ):
+        if len(self._buffer) == self._buffer.maxlen:
+            metrics.incr("audit.dropped")
+
+        self._buffer.append({
+            "created_at": datetime.now(timezone.utc),
+            "event_type": event_type,
+            "success": success,
+            "user_id": user_id,
+            "email": email,
+            "ip_address": ip_address,
+            "request_id": request_id_var.get(),
+            "details": details or None,
+        })
+
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_partitions(self, conn, now: datetime):
+        if engine.dialect.name != "postgresql":
+            return
+        if self._partitioned_through is not None and now < self._partitioned_through:
+            return
+
+        for offset in (0, 1):
+            start, end = _month_start(now, offset), _month_start(now, offset + 1)
+            name = f"tbl_audit_events_y{start.year}m{start.month:02d}"
+            try:
+                with conn.begin_nested():
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF tbl_audit_events "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    ))
+            except Exception as e:
+                logger.warning("Could not create audit partition", extra={"partition": name, "error": str(e)})
+
+        self._partitioned_through = _month_start(now, 1)
+
+    def _assign_ids(self, conn, batch: list):
+        if engine.dialect.name == "postgresql":
+            return
+        if self._next_id is None:
+            self._next_id = (conn.execute(select(func.max(AuditEvent.id))).scalar() or 0) + 1
+        for event in batch:
+            if "id" not in event:
+                event["id"] = self._next_id
+                self._next_id += 1
+
+    def _requeue(self, batch: list):
+        overflow = len(self._buffer) + len(batch) - self._buffer.maxlen
+        if overflow > 0:
+            metrics.incr("audit.dropped", overflow)
+        for event in batch:
+            event.pop("id", None)
+        self._buffer.extendleft(reversed(batch))
+
+    def retry_delay(self) -> float:
+        if not self._failures:
+            return self.flush_interval_seconds
+        return min(self.flush_interval_seconds * 2 ** self._failures, 60.0)
+
+    def flush(self) -> int:
+        written = 0
+        while self._buffer:
+            batch = []
+            while self._buffer and len(batch) < self.batch_size:
+                batch.append(self._buffer.popleft())
+
+            try:
+                with engine.begin() as conn:
+                    self._ensure_partitions(conn, batch[-1]["created_at"])
+                    self._assign_ids(conn, batch)
+                    conn.execute(insert(AuditEvent.__table__), batch)
+            except Exception as e:
+                self._next_id = None
+                self._failures += 1
+                self._requeue(batch)
+                metrics.incr("audit.flush_errors")
+                logger.error("Audit batch write failed", exc_info=e, extra={"batch_size": len(batch)})
+                return written
+
+            self._failures = 0
+            written += len(batch)
+            metrics.incr("audit.written", len(batch))
+        return written
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._failures:
+                self._stop.wait(self.retry_delay())
+            else:
+                self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+
+audit = AuditWriter(
+    settings.AUDIT_BUFFER_SIZE,
+    settings.AUDIT_BATCH_SIZE,
+    settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
+metrics.register_gauge("audit.pending", audit.pending)
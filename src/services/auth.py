@@ -1,17 +1,37 @@
+import secrets
+import time
 from datetime import datetime, timedelta
+from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from src.models.user import User, RefreshToken, OTP, AuthProvider
+from fastapi.concurrency import run_in_threadpool
+from src.models.user import User, RefreshToken, AuthProvider
 from src.schemas.auth import UserRegister, UserLogin
 from src.utils.security import (
     get_password_hash,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     generate_otp,
-    decode_token
+    decode_token,
+    revoked_tokens
 )
 from src.services.email import EmailService
+from src.services.otp_store import get_otp_store
+from src.services.audit import audit
+from src.services.activity import activity
+from src.services.revocation_feed import record_revocation
+from src.services.user_directory import user_directory
+from src.utils.magic_link import (
+    build_magic_link,
+    create_magic_token,
+    fingerprint_matches,
+    load_magic_token,
+    magic_link_enabled
+)
+from src.database import record_write
+from src.utils.tracing import traced
+from src.utils.metrics import metrics
 from src.config import get_settings
 
 settings = get_settings()
@@ -19,6 +39,75 @@ settings = get_settings()
 
 class AuthService:
     @staticmethod
+    @traced("AuthService.issue_otp")
+    def issue_otp(db: Session, email: str, otp_type: str) -> Optional[str]:
+        store = get_otp_store()
+        ttl_seconds = settings.OTP_EXPIRE_MINUTES * 60
+
+        if not store.claim_send(db, email, otp_type, settings.OTP_RESEND_COOLDOWN_SECONDS):
+            metrics.incr("otp.suppressed_sends")
+            return None
+
+        active = store.get_active(db, email, otp_type)
+        if active is not None and time.time() - active.issued_at < settings.OTP_REUSE_WINDOW_SECONDS:
+            store.extend(db, email, otp_type, ttl_seconds)
+            metrics.incr("otp.reused")
+            return active.otp_code
+
+        otp_code = generate_otp()
+        store.issue(db, email, otp_type, otp_code, ttl_seconds)
+        metrics.incr("otp.issued")
+        return otp_code
+
+    @staticmethod
+    def claim_magic_link_send(db: Session, email: str, purpose: str) -> bool:
+        # Magic links carry no server state, so a marker entry in the OTP store
+        # applies the same per-email resend cooldown as OTP challenges.
+        store = get_otp_store()
+        marker_type = f"{purpose}_link"
+
+        if not store.claim_send(db, email, marker_type, settings.OTP_RESEND_COOLDOWN_SECONDS):
+            metrics.incr("otp.suppressed_sends")
+            return False
+
+        store.issue(db, email, marker_type, generate_otp(), settings.OTP_RESEND_COOLDOWN_SECONDS)
+        return True
+
+    @staticmethod
+    async def send_challenge(db: Session, user: User, purpose: str) -> bool:
+        if magic_link_enabled(purpose):
+            if not AuthService.claim_magic_link_send(db, user.email, purpose):
+                return False
+
+            link = build_magic_link(create_magic_token(user, purpose), purpose)
+            await EmailService.send_magic_link_email(user.email, link, purpose)
+            metrics.incr("magic_link.issued")
+            return True
+
+        otp_code = AuthService.issue_otp(db, user.email, purpose)
+        if not otp_code:
+            return False
+
+        if purpose == "password_reset":
+            await EmailService.send_password_reset_email(user.email, otp_code)
+        else:
+            await EmailService.send_verification_email(user.email, otp_code)
+        return True
+
+    @staticmethod
+    def load_magic_link_user(db: Session, token: str, purpose: str) -> User:
+        payload = load_magic_token(token, purpose)
+        user = db.query(User).filter(User.email == payload["email"]).first() if payload else None
+
+        if not user or not fingerprint_matches(user, payload):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired link"
+            )
+        return user
+
+    @staticmethod
+    @traced("AuthService.register_user")
     async def register_user(db: Session, user_data: UserRegister):
         existing_user = db.query(User).filter(User.email == user_data.email).first()
         if existing_user:
@@ -27,7 +116,7 @@ class AuthService:
                 detail="Email already registered"
             )
         
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
         new_user = User(
             email=user_data.email,
             hashed_password=hashed_password,
@@ -37,39 +126,20 @@ class AuthService:
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
+        record_write()
 
-        otp_code = generate_otp()
-        otp_expires = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
-        
-        otp_record = OTP(
-            email=user_data.email,
-            otp_code=otp_code,
-            otp_type="email_verification",
-            expires_at=otp_expires
-        )
-        db.add(otp_record)
-        db.commit()
-        
-        await EmailService.send_verification_email(user_data.email, otp_code)
+        await AuthService.send_challenge(db, new_user, "email_verification")
         
         return new_user
 
     @staticmethod
+    @traced("AuthService.verify_email")
     async def verify_email(db: Session, email: str, otp_code: str):
-        otp_record = db.query(OTP).filter(
-            OTP.email == email,
-            OTP.otp_code == otp_code,
-            OTP.otp_type == "email_verification",
-            OTP.is_used == False,
-            OTP.expires_at > datetime.utcnow()
-        ).first()
-        
-        if not otp_record:
+        if not get_otp_store().consume(db, email, "email_verification", otp_code):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired OTP"
             )
-        otp_record.is_used = True
         
         user = db.query(User).filter(User.email == email).first()
         if not user:
@@ -78,21 +148,62 @@ class AuthService:
                 detail="User not found"
             )
         
+        return AuthService.complete_verification(db, user)
+
+    @staticmethod
+    @traced("AuthService.verify_email_magic")
+    async def verify_email_magic(db: Session, token: str):
+        user = AuthService.load_magic_link_user(db, token, "email_verification")
+        return AuthService.complete_verification(db, user)
+
+    @staticmethod
+    def complete_verification(db: Session, user: User):
         user.is_verified = True
         user.is_active = True
         
         db.commit()
+        record_write()
+        user_directory.invalidate(user.id)
         return user
 
     @staticmethod
-    def login_user(db: Session, login_data: UserLogin):
+    @traced("AuthService.login_user")
+    def login_user(
+        db: Session,
+        login_data: UserLogin,
+        user_agent: Optional[str] = None,
+        ip_address: Optional[str] = None
+    ):
+        try:
+            user = AuthService.authenticate(db, login_data)
+        except HTTPException as e:
+            audit.record("login", success=False, email=login_data.email, ip_address=ip_address, reason=e.detail)
+            raise
+
+        result = AuthService.create_session(db, user, user_agent, ip_address)
+        audit.record("login", user_id=user.id, email=user.email, ip_address=ip_address)
+        activity.record_login(user.id)
+        return result
+
+    @staticmethod
+    def authenticate(db: Session, login_data: UserLogin) -> User:
         user = db.query(User).filter(User.email == login_data.email).first()
         
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        if not user or not user.hashed_password:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
+
+        verified, new_hash = verify_and_update_password(login_data.password, user.hashed_password)
+        if not verified:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password"
+            )
+
+        if new_hash:
+            user.hashed_password = new_hash
         
         if not user.is_verified:
             raise HTTPException(
@@ -106,16 +217,34 @@ class AuthService:
                 detail="Account is inactive"
             )
         
-        access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
+        return user
+
+    @staticmethod
+    def create_session(
+        db: Session,
+        user: User,
+        user_agent: Optional[str] = None,
+        ip_address: Optional[str] = None
+    ):
+        # Each device gets its own session row, and the token column is
+        # unique, so two logins within the same second need distinct tokens.
+        refresh_token = create_refresh_token(data={"sub": str(user.id), "jti": secrets.token_urlsafe(16)})
         
         refresh_token_expires = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         refresh_token_record = RefreshToken(
             user_id=user.id,
             token=refresh_token,
-            expires_at=refresh_token_expires
+            expires_at=refresh_token_expires,
+            user_agent=user_agent[:512] if user_agent else None,
+            ip_address=ip_address,
+            last_used_at=datetime.utcnow()
         )
         db.add(refresh_token_record)
+        db.flush()
+
+        access_token = create_access_token(
+            data={"sub": str(user.id), "email": user.email, "sid": refresh_token_record.id}
+        )
         db.commit()
         
         return {
@@ -125,39 +254,23 @@ class AuthService:
         }
 
     @staticmethod
-    async def forgot_password(db: Session, email: str):
-        user = db.query(User).filter(User.email == email).first()
+    @traced("AuthService.forgot_password")
+    async def forgot_password(db: Session, email: str, read_db: Optional[Session] = None):
+        user = (read_db or db).query(User).filter(User.email == email).first()
         
         if not user:
             return {"message": "If the email exists, a reset code has been sent"}
         
-        otp_code = generate_otp()
-        otp_expires = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
-        
-        otp_record = OTP(
-            email=email,
-            otp_code=otp_code,
-            otp_type="password_reset",
-            expires_at=otp_expires
-        )
-        db.add(otp_record)
-        db.commit()
-        
-        await EmailService.send_password_reset_email(email, otp_code)
+        sent = await AuthService.send_challenge(db, user, "password_reset")
+        audit.record("password_reset_requested", user_id=user.id, email=email, sent=sent)
         
         return {"message": "If the email exists, a reset code has been sent"}
 
     @staticmethod
+    @traced("AuthService.reset_password")
     async def reset_password(db: Session, email: str, otp_code: str, new_password: str):
-        otp_record = db.query(OTP).filter(
-            OTP.email == email,
-            OTP.otp_code == otp_code,
-            OTP.otp_type == "password_reset",
-            OTP.is_used == False,
-            OTP.expires_at > datetime.utcnow()
-        ).first()
-        
-        if not otp_record:
+        if not get_otp_store().consume(db, email, "password_reset", otp_code):
+            audit.record("password_reset", success=False, email=email, reason="invalid_otp")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired OTP"
@@ -170,15 +283,33 @@ class AuthService:
                 detail="User not found"
             )
         
+        return await run_in_threadpool(AuthService.complete_password_reset, db, user, new_password)
+
+    @staticmethod
+    @traced("AuthService.reset_password_magic")
+    async def reset_password_magic(db: Session, token: str, new_password: str):
+        try:
+            user = AuthService.load_magic_link_user(db, token, "password_reset")
+        except HTTPException:
+            audit.record("password_reset", success=False, reason="invalid_link")
+            raise
+        return await run_in_threadpool(AuthService.complete_password_reset, db, user, new_password)
+
+    @staticmethod
+    def complete_password_reset(db: Session, user: User, new_password: str):
         user.hashed_password = get_password_hash(new_password)
-        otp_record.is_used = True
         
         db.query(RefreshToken).filter(RefreshToken.user_id == user.id).update({"revoked": True})
+        record_revocation(db, user.id, None, "password_reset")
         
         db.commit()
+        record_write()
+        revoked_tokens.revoke_user(user.id)
+        audit.record("password_reset", user_id=user.id, email=user.email)
         return user
 
     @staticmethod
+    @traced("AuthService.refresh_access_token")
     def refresh_access_token(db: Session, refresh_token: str):
         payload = decode_token(refresh_token)
         if not payload or payload.get("type") != "refresh":
@@ -194,6 +325,7 @@ class AuthService:
         ).first()
         
         if not token_record:
+            audit.record("token_refresh", success=False, user_id=int(payload.get("sub")), reason="expired_or_revoked")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token expired or revoked"
@@ -208,13 +340,70 @@ class AuthService:
                 detail="User not found"
             )
         
-        access_token = create_access_token(data={"sub": str(user.id), "email": user.email})
+        token_record.last_used_at = datetime.utcnow()
+        db.commit()
+        audit.record("token_refresh", user_id=user.id, session_id=token_record.id)
+
+        access_token = create_access_token(
+            data={"sub": str(user.id), "email": user.email, "sid": token_record.id}
+        )
         
         return {"access_token": access_token}
 
     @staticmethod
-    async def resend_verification_otp(db: Session, email: str):
-        user = db.query(User).filter(User.email == email).first()
+    @traced("AuthService.list_sessions")
+    def list_sessions(db: Session, user_id: int):
+        return db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked == False,
+            RefreshToken.expires_at > datetime.utcnow()
+        ).order_by(RefreshToken.last_used_at.desc()).all()
+
+    @staticmethod
+    @traced("AuthService.revoke_session")
+    def revoke_session(db: Session, user_id: int, session_id: int):
+        revoked = db.query(RefreshToken).filter(
+            RefreshToken.id == session_id,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked == False
+        ).update({"revoked": True})
+
+        if not revoked:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found"
+            )
+
+        record_revocation(db, user_id, session_id, "session_revoked")
+        db.commit()
+        record_write()
+        revoked_tokens.revoke_session(user_id, session_id)
+        audit.record("session_revoked", user_id=user_id, session_id=session_id)
+
+    @staticmethod
+    @traced("AuthService.logout")
+    def logout(db: Session, user_id: int, session_id: Optional[int] = None):
+        query = db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked == False
+        )
+        if session_id is not None:
+            query = query.filter(RefreshToken.id == session_id)
+
+        query.update({"revoked": True})
+        record_revocation(db, user_id, session_id, "logout")
+        db.commit()
+        record_write()
+        if session_id is not None:
+            revoked_tokens.revoke_session(user_id, session_id)
+        else:
+            revoked_tokens.revoke_user(user_id)
+        audit.record("logout", user_id=user_id, session_id=session_id, all_sessions=session_id is None)
+
+    @staticmethod
+    @traced("AuthService.resend_verification_otp")
+    async def resend_verification_otp(db: Session, email: str, read_db: Optional[Session] = None):
+        user = (read_db or db).query(User).filter(User.email == email).first()
         
         if not user:
             raise HTTPException(
@@ -228,18 +417,6 @@ class AuthService:
                 detail="Email already verified"
             )
         
-        otp_code = generate_otp()
-        otp_expires = datetime.utcnow() + timedelta(minutes=settings.OTP_EXPIRE_MINUTES)
-        
-        otp_record = OTP(
-            email=email,
-            otp_code=otp_code,
-            otp_type="email_verification",
-            expires_at=otp_expires
-        )
-        db.add(otp_record)
-        db.commit()
-        
-        await EmailService.send_verification_email(email, otp_code)
+        await AuthService.send_challenge(db, user, "email_verification")
         
         return {"message": "Verification code sent"}
\ No newline at end of file
@@ -3,8 +3,11 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from jinja2 import Template
 from src.config import get_settings
+from src.utils.logger import get_logger
+from src.utils.tracing import span
 
 settings = get_settings()
+logger = get_logger(__name__)
 
 
 class EmailService:
@@ -19,17 +22,18 @@ class EmailService:
         message.attach(html_part)
 
         try:
-            await aiosmtplib.send(
-                message,
-                hostname=settings.SMTP_HOST,
-                port=settings.SMTP_PORT,
-                username=settings.SMTP_USERNAME,
-                password=settings.SMTP_PASSWORD,
-                start_tls=True,
-            )
+            with span("smtp.send", smtp_host=settings.SMTP_HOST):
+                await aiosmtplib.send(
+                    message,
+                    hostname=settings.SMTP_HOST,
+                    port=settings.SMTP_PORT,
+                    username=settings.SMTP_USERNAME,
+                    password=settings.SMTP_PASSWORD,
+                    start_tls=True,
+                )
             return True
         except Exception as e:
-            print(f"Error sending email: {e}")
+            logger.error("Error sending email", exc_info=e, extra={"subject": subject})
             return False
 
     @staticmethod
@@ -133,4 +137,61 @@ class EmailService:
             to_email,
             f"Reset Your Password - {settings.APP_NAME}",
             html_content
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    async def send_magic_link_email(to_email: str, link: str, purpose: str):
+        is_reset = purpose == "password_reset"
+        html_template = Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                .header { background-color: {{ color }}; color: white; padding: 20px; text-align: center; }
+                .content { padding: 30px 20px; background-color: #f9fafb; }
+                .button { display: inline-block; background-color: {{ color }}; color: white; padding: 14px 28px; text-decoration: none; border-radius: 4px; }
+                .footer { text-align: center; padding: 20px; color: #6b7280; font-size: 12px; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>{{ app_name }}</h1>
+                </div>
+                <div class="content">
+                    <h2>{{ heading }}</h2>
+                    <p>{{ intro }}</p>
+                    <p style="text-align: center;"><a class="button" href="{{ link }}">{{ action }}</a></p>
+                    <p>This link will expire in {{ expire_minutes }} minutes and can only be used once.</p>
+                    <p>If you didn't request this, please ignore this email.</p>
+                </div>
+                <div class="footer">
+                    <p>&copy; 2024 {{ app_name }}. All rights reserved.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+        html_content = html_template.render(
+            app_name=settings.APP_NAME,
+            color="#DC2626" if is_reset else "#4F46E5",
+            heading="Reset Your Password" if is_reset else "Verify Your Email",
+            intro=(
+                "We received a request to reset your password. Click the button below to choose a new one:"
+                if is_reset else
+                "Thank you for registering! Click the button below to verify your email address:"
+            ),
+            action="Reset Password" if is_reset else "Verify Email",
+            link=link,
+            expire_minutes=settings.MAGIC_LINK_EXPIRE_MINUTES
+        )
+
+        subject = "Reset Your Password" if is_reset else "Verify Your Email"
+        await EmailService.send_email(
+            to_email,
+            f"{subject} - {settings.APP_NAME}",
+            html_content
+        )
@@ -0,0 +1,235 @@
+import asyncio
+import secrets
+import time
+from typing import Optional
+from urllib.parse import urlencode
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from src.models.user import User, AuthProvider
+from src.services.auth import AuthService
+from src.schemas.auth import normalize_email
+from src.database import record_write
+from src.services.user_directory import user_directory
+from src.utils.http import get_http_client
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.tracing import span, traced
+from src.config import get_settings
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+class OIDCMetadataCache:
+    def __init__(self, discovery_url: str, ttl_seconds: float, min_forced_refresh_seconds: float = 60.0):
+        self.discovery_url = discovery_url
+        self.ttl_seconds = ttl_seconds
+        self.min_forced_refresh_seconds = min_forced_refresh_seconds
+        self.discovery: Optional[dict] = None
+        self.jwks: dict = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _is_fresh(self) -> bool:
+        return self.discovery is not None and time.monotonic() - self._fetched_at < self.ttl_seconds
+
+    async def refresh(self):
+        async with self._lock:
+            client = get_http_client()
+            with span("oidc.refresh_metadata"):
+                response = await client.get(self.discovery_url)
+                response.raise_for_status()
+                discovery = response.json()
+
+                response = await client.get(discovery["jwks_uri"])
+                response.raise_for_status()
+                jwks = {key["kid"]: key for key in response.json()["keys"] if "kid" in key}
+
+            self.discovery = discovery
+            self.jwks = jwks
+            self._fetched_at = time.monotonic()
+            metrics.incr("oidc.metadata_refreshes")
+
+    async def get_discovery(self) -> dict:
+        if not self._is_fresh():
+            await self.refresh()
+        return self.discovery
+
+    async def get_signing_key(self, kid: str) -> Optional[dict]:
+        if not self._is_fresh():
+            await self.refresh()
+
+        key = self.jwks.get(kid)
+        if key is None and time.monotonic() - self._fetched_at >= self.min_forced_refresh_seconds:
+            # Unknown kid usually means the provider rotated keys.
+            await self.refresh()
+            key = self.jwks.get(kid)
+        return key
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                metrics.incr("oidc.metadata_refresh_errors")
+                logger.warning("OIDC metadata refresh failed", extra={"error": type(e).__name__})
+            await asyncio.sleep(self.ttl_seconds / 2)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+google_metadata = OIDCMetadataCache(
+    settings.GOOGLE_DISCOVERY_URL,
+    settings.GOOGLE_METADATA_TTL_SECONDS,
+)
+
+
+class GoogleOAuthService:
+    @staticmethod
+    def generate_state() -> dict:
+        return {"state": secrets.token_urlsafe(24), "nonce": secrets.token_urlsafe(24)}
+
+    @staticmethod
+    async def get_authorization_url(state: str, nonce: str) -> str:
+        discovery = await google_metadata.get_discovery()
+        params = {
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            "response_type": "code",
+            "scope": "openid email profile",
+            "state": state,
+            "nonce": nonce,
+            "prompt": "select_account",
+        }
+        return f"{discovery['authorization_endpoint']}?{urlencode(params)}"
+
+    @staticmethod
+    @traced("GoogleOAuthService.exchange_code")
+    async def exchange_code(code: str) -> dict:
+        discovery = await google_metadata.get_discovery()
+        response = await get_http_client().post(
+            discovery["token_endpoint"],
+            data={
+                "code": code,
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code",
+            },
+        )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Google authorization code exchange failed"
+            )
+        return response.json()
+
+    @staticmethod
+    @traced("GoogleOAuthService.verify_id_token")
+    async def verify_id_token(id_token: str, nonce: str, access_token: Optional[str] = None) -> dict:
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except JWTError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Malformed ID token")
+
+        key = await google_metadata.get_signing_key(header.get("kid"))
+        if key is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown ID token signing key")
+
+        discovery = await google_metadata.get_discovery()
+        try:
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=settings.GOOGLE_CLIENT_ID,
+                issuer=discovery["issuer"],
+                access_token=access_token,
+            )
+        except JWTError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid ID token")
+
+        if not secrets.compare_digest(claims.get("nonce", ""), nonce):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="ID token nonce mismatch")
+
+        return claims
+
+    @staticmethod
+    @traced("GoogleOAuthService.get_or_create_user")
+    def get_or_create_user(db: Session, claims: dict) -> User:
+        google_id = claims["sub"]
+        email = normalize_email(claims["email"]) if claims.get("email") else None
+        email_verified = bool(claims.get("email_verified"))
+
+        user = db.query(User).filter(User.google_id == google_id).first()
+
+        if not user and email and email_verified:
+            user = db.query(User).filter(User.email == email).first()
+            if user:
+                if not user.is_verified:
+                    # Whoever registered this address never proved they own it,
+                    # so the password they chose must not survive the link.
+                    user.hashed_password = None
+                    user.auth_provider = AuthProvider.GOOGLE
+                    user.is_active = True
+                user.google_id = google_id
+                user.is_verified = True
+
+        if not user:
+            if not email or not email_verified:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Google account email is not verified"
+                )
+            user = User(
+                email=email,
+                full_name=claims.get("name"),
+                google_id=google_id,
+                auth_provider=AuthProvider.GOOGLE,
+                is_verified=True,
+                is_active=True
+            )
+            db.add(user)
+
+        db.commit()
+        db.refresh(user)
+        record_write()
+        user_directory.invalidate(user.id)
+        return user
+
+    @staticmethod
+    async def handle_callback(
+        db: Session,
+        code: str,
+        nonce: str,
+        user_agent: Optional[str] = None,
+        ip_address: Optional[str] = None
+    ):
+        tokens = await GoogleOAuthService.exchange_code(code)
+        claims = await GoogleOAuthService.verify_id_token(
+            tokens["id_token"],
+            nonce,
+            tokens.get("access_token")
+        )
+        user = GoogleOAuthService.get_or_create_user(db, claims)
+
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is inactive"
+            )
+
+        return AuthService.create_session(db, user, user_agent, ip_address)
@@ -0,0 +1,264 @@
+import heapq
+import json
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from src.models.user import OTP
+from src.config import get_settings
+
+settings = get_settings()
+
+
+class ActiveOTP(NamedTuple):
+    otp_code: str
+    issued_at: float
+    last_sent_at: float
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class OTPStore(ABC):
+    @abstractmethod
+    def issue(self, db: Session, email: str, otp_type: str, otp_code: str, ttl_seconds: int):
+        ...
+
+    @abstractmethod
+    def consume(self, db: Session, email: str, otp_type: str, otp_code: str) -> bool:
+        ...
+
+    @abstractmethod
+    def get_active(self, db: Session, email: str, otp_type: str) -> Optional[ActiveOTP]:
+        ...
+
+    @abstractmethod
+    def extend(self, db: Session, email: str, otp_type: str, ttl_seconds: int):
+        ...
+
+    @abstractmethod
+    def claim_send(self, db: Session, email: str, otp_type: str, cooldown_seconds: int) -> bool:
+        ...
+
+
+class SQLOTPStore(OTPStore):
+    def issue(self, db: Session, email: str, otp_type: str, otp_code: str, ttl_seconds: int):
+        now = datetime.utcnow()
+        db.query(OTP).filter(
+            OTP.email == email,
+            OTP.expires_at <= now
+        ).delete(synchronize_session=False)
+
+        otp_record = OTP(
+            email=email,
+            otp_code=otp_code,
+            otp_type=otp_type,
+            expires_at=now + timedelta(seconds=ttl_seconds),
+            last_sent_at=now
+        )
+        db.add(otp_record)
+        db.commit()
+
+    def _active_record(self, db: Session, email: str, otp_type: str) -> Optional[OTP]:
+        return db.query(OTP).filter(
+            OTP.email == email,
+            OTP.otp_type == otp_type,
+            OTP.is_used == False,
+            OTP.expires_at > datetime.utcnow()
+        ).order_by(OTP.id.desc()).first()
+
+    def get_active(self, db: Session, email: str, otp_type: str) -> Optional[ActiveOTP]:
+        otp_record = self._active_record(db, email, otp_type)
+        if not otp_record:
+            return None
+
+        last_sent_at = _epoch(otp_record.last_sent_at or otp_record.created_at)
+        return ActiveOTP(otp_record.otp_code, _epoch(otp_record.created_at) or last_sent_at, last_sent_at)
+
+    def extend(self, db: Session, email: str, otp_type: str, ttl_seconds: int):
+        otp_record = self._active_record(db, email, otp_type)
+        if not otp_record:
+            return
+
+        now = datetime.utcnow()
+        otp_record.expires_at = now + timedelta(seconds=ttl_seconds)
+        otp_record.last_sent_at = now
+        db.commit()
+
+    def claim_send(self, db: Session, email: str, otp_type: str, cooldown_seconds: int) -> bool:
+        if cooldown_seconds <= 0:
+            return True
+
+        if db.get_bind().dialect.name == "postgresql":
+            # Serialises concurrent claims for one address until the caller
+            # commits, which also covers the first send when no row exists yet.
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+                {"key": f"otp:{otp_type}:{email}"}
+            )
+
+        otp_record = self._active_record(db, email, otp_type)
+        if not otp_record:
+            return True
+
+        now = datetime.utcnow()
+        claimed = db.query(OTP).filter(
+            OTP.id == otp_record.id,
+            func.coalesce(OTP.last_sent_at, OTP.created_at) <= now - timedelta(seconds=cooldown_seconds)
+        ).update({OTP.last_sent_at: now}, synchronize_session=False)
+
+        if not claimed:
+            db.commit()
+        return claimed == 1
+
+    def consume(self, db: Session, email: str, otp_type: str, otp_code: str) -> bool:
+        otp_record = db.query(OTP).filter(
+            OTP.email == email,
+            OTP.otp_code == otp_code,
+            OTP.otp_type == otp_type,
+            OTP.is_used == False,
+            OTP.expires_at > datetime.utcnow()
+        ).first()
+
+        if not otp_record:
+            return False
+
+        otp_record.is_used = True
+        return True
+
+
+class InMemoryKV:
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, float]] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float):
+        while self._expiries and self._expiries[0][0] <= now:
+            expires, key = heapq.heappop(self._expiries)
+            entry = self._data.get(key)
+            # Overwritten keys leave stale heap entries; only drop a matching one.
+            if entry is not None and entry[1] == expires:
+                del self._data[key]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self._data[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: str, ex: int, nx: bool = False) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            if nx:
+                entry = self._data.get(key)
+                if entry is not None and entry[1] > now:
+                    return False
+            self._data[key] = (value, now + ex)
+            heapq.heappush(self._expiries, (now + ex, key))
+            return True
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            return 1 if self._data.pop(key, None) is not None else 0
+
+
+class RedisKV:
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("OTP_STORE_BACKEND=redis requires the 'redis' package") from e
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ex: int, nx: bool = False) -> bool:
+        return bool(self._client.set(key, value, ex=ex, nx=nx))
+
+    def delete(self, key: str) -> int:
+        return self._client.delete(key)
+
+
+class KVOTPStore(OTPStore):
+    def __init__(self, client):
+        self.client = client
+
+    @staticmethod
+    def _key(email: str, otp_type: str) -> str:
+        return f"otp:{otp_type}:{email}"
+
+    def _load(self, email: str, otp_type: str) -> Optional[ActiveOTP]:
+        stored = self.client.get(self._key(email, otp_type))
+        if stored is None:
+            return None
+
+        entry = json.loads(stored)
+        return ActiveOTP(entry["code"], entry["issued_at"], entry["sent_at"])
+
+    def _save(self, email: str, otp_type: str, active: ActiveOTP, ttl_seconds: int):
+        value = json.dumps({
+            "code": active.otp_code,
+            "issued_at": active.issued_at,
+            "sent_at": active.last_sent_at,
+        })
+        self.client.set(self._key(email, otp_type), value, ex=ttl_seconds)
+
+    def issue(self, db: Session, email: str, otp_type: str, otp_code: str, ttl_seconds: int):
+        now = time.time()
+        self._save(email, otp_type, ActiveOTP(otp_code, now, now), ttl_seconds)
+
+    def consume(self, db: Session, email: str, otp_type: str, otp_code: str) -> bool:
+        active = self._load(email, otp_type)
+
+        if active is None or not secrets.compare_digest(active.otp_code, otp_code):
+            return False
+
+        return self.client.delete(self._key(email, otp_type)) == 1
+
+    def get_active(self, db: Session, email: str, otp_type: str) -> Optional[ActiveOTP]:
+        return self._load(email, otp_type)
+
+    def extend(self, db: Session, email: str, otp_type: str, ttl_seconds: int):
+        active = self._load(email, otp_type)
+        if active is not None:
+            self._save(email, otp_type, active._replace(last_sent_at=time.time()), ttl_seconds)
+
+    def claim_send(self, db: Session, email: str, otp_type: str, cooldown_seconds: int) -> bool:
+        if cooldown_seconds <= 0:
+            return True
+        return self.client.set(f"otp-cooldown:{otp_type}:{email}", "1", ex=cooldown_seconds, nx=True)
+
+
+@lru_cache()
+def get_otp_store() -> OTPStore:
+    backend = settings.OTP_STORE_BACKEND
+
+    if backend == "sql":
+        return SQLOTPStore()
+    if backend == "memory":
+        return KVOTPStore(InMemoryKV())
+    if backend == "redis":
+        if not settings.OTP_STORE_URL:
+            raise RuntimeError("OTP_STORE_URL is required when OTP_STORE_BACKEND=redis")
+        return KVOTPStore(RedisKV(settings.OTP_STORE_URL))
+
+    raise RuntimeError(f"Unknown OTP_STORE_BACKEND: {backend}")
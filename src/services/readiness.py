@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Optional
+from sqlalchemy import text
+from src.config import get_settings
+from src.database import engine, pool_stats
+from src.utils.metrics import metrics
+
+settings = get_settings()
+
+
+class ReadinessChecker:
+    def __init__(self, refresh_seconds: float, timeout_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.timeout_seconds = timeout_seconds
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+
+    @staticmethod
+    def _ping_db():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    async def check_db(self) -> dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self._ping_db), self.timeout_seconds)
+            return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__}
+
+    async def check_smtp(self) -> dict:
+        start = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(settings.SMTP_HOST, settings.SMTP_PORT),
+                self.timeout_seconds
+            )
+            writer.close()
+            await writer.wait_closed()
+            return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__}
+
+    @staticmethod
+    def check_pool() -> dict:
+        stats = pool_stats()
+        capacity = stats["size"] + stats["max_overflow"]
+        saturation = stats["checked_out"] / capacity if capacity else 0.0
+        return {
+            **stats,
+            "saturation": round(saturation, 3),
+            "saturated": saturation >= settings.READINESS_POOL_SATURATION_THRESHOLD,
+        }
+
+    async def refresh(self) -> dict:
+        async with self._refresh_lock:
+            db, smtp = await asyncio.gather(self.check_db(), self.check_smtp())
+            pool = self.check_pool()
+
+            ready = db["ok"] and (smtp["ok"] or not settings.READINESS_REQUIRE_SMTP)
+            degraded = ready and (not smtp["ok"] or pool["saturated"])
+
+            self._result = {
+                "ready": ready,
+                "status": "unavailable" if not ready else "degraded" if degraded else "ready",
+                "checks": {"database": db, "smtp": smtp, "db_pool": pool},
+            }
+            self._checked_at = time.monotonic()
+            metrics.incr("readiness.refreshes")
+            metrics.set_gauge("readiness.ready", 1 if ready else 0)
+            return self._result
+
+    async def get(self) -> dict:
+        age = time.monotonic() - self._checked_at
+        if self._result is None or age > self.refresh_seconds * 3:
+            result = await self.refresh()
+            age = 0.0
+        else:
+            result = self._result
+        return {**result, "checked_seconds_ago": round(age, 2)}
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                metrics.incr("readiness.refresh_errors")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+readiness = ReadinessChecker(
+    settings.READINESS_REFRESH_SECONDS,
+    settings.READINESS_CHECK_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,273 @@
+import asyncio
+import json
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from src.config import get_settings
+from src.database import SessionLocal, engine
+from src.models.user import RevocationEvent
+from src.utils.ids import external_id
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.security import revoked_tokens
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+def record_revocation(db: Session, user_id: int, session_id: Optional[int], reason: str):
+    if engine.dialect.name == "postgresql":
+        # Take the transaction id before the event id is drawn from the
+        # sequence, so the feed's snapshot check covers this transaction.
+        db.execute(text("SELECT pg_current_xact_id()"))
+    db.add(RevocationEvent(user_id=user_id, session_id=session_id, reason=reason))
+
+
+def _event_dict(event: RevocationEvent) -> dict:
+    return {
+        "offset": event.id,
+        "user_id": external_id(event.user_id),
+        "session_id": external_id(event.session_id),
+        "reason": event.reason,
+        "timestamp": event.created_at.isoformat() if event.created_at else None,
+    }
+
+
+def _fetch_after(offset: int, limit: int, horizon: Optional[int] = None) -> List[dict]:
+    db = SessionLocal()
+    try:
+        query = db.query(RevocationEvent).filter(RevocationEvent.id > offset)
+        if horizon is not None:
+            query = query.filter(RevocationEvent.id <= horizon)
+        events = query.order_by(RevocationEvent.id).limit(limit).all()
+        return [_event_dict(event) for event in events]
+    finally:
+        db.close()
+
+
+def _fetch_recent(upto_offset: int) -> List[dict]:
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - timedelta(seconds=revoked_tokens.token_lifetime_seconds)
+        events = db.query(RevocationEvent).filter(
+            RevocationEvent.created_at >= since,
+            RevocationEvent.id <= upto_offset
+        ).order_by(RevocationEvent.id).all()
+        return [_event_dict(event) for event in events]
+    finally:
+        db.close()
+
+
+def _apply_to_tokens(events: List[dict]):
+    # Every worker applies every event, so an access token revoked through
+    # one worker is rejected by all of them, not just the one that handled it.
+    for event in events:
+        revoked_at = None
+        if event["timestamp"]:
+            created_at = datetime.fromisoformat(event["timestamp"])
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            revoked_at = created_at.timestamp()
+
+        if event["session_id"] is not None:
+            revoked_tokens.revoke_session(event["user_id"], event["session_id"], revoked_at)
+        else:
+            revoked_tokens.revoke_user(event["user_id"], revoked_at)
+
+
+def _snapshot_marker() -> Tuple[int, int, int]:
+    db = SessionLocal()
+    try:
+        last_value = db.execute(text(
+            "SELECT pg_sequence_last_value(pg_get_serial_sequence('tbl_revocation_events', 'id')::regclass)"
+        )).scalar()
+        db.commit()
+        xmin, xmax = db.execute(text(
+            "SELECT pg_snapshot_xmin(s)::text::bigint, pg_snapshot_xmax(s)::text::bigint "
+            "FROM pg_current_snapshot() AS s"
+        )).one()
+        return xmin, xmax, last_value or 0
+    finally:
+        db.close()
+
+
+def _offset_bounds():
+    db = SessionLocal()
+    try:
+        return db.query(func.min(RevocationEvent.id), func.max(RevocationEvent.id)).one()
+    finally:
+        db.close()
+
+
+def _purge_expired() -> int:
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(hours=settings.REVOCATION_EVENT_RETENTION_HOURS)
+        deleted = db.query(RevocationEvent).filter(
+            RevocationEvent.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+class Subscriber:
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+
+class RevocationFeed:
+    def __init__(self, poll_interval_seconds: float, batch_size: int = 500, subscriber_queue_size: int = 1000):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self._last_offset: Optional[int] = None
+        self._horizon: Optional[int] = None
+        self._markers: deque = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._offset_lock = asyncio.Lock()
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.subscriber_queue_size)
+        self._subscribers.add(subscriber)
+        metrics.set_gauge("revocation_feed.subscribers", len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        metrics.set_gauge("revocation_feed.subscribers", len(self._subscribers))
+
+    def _publish(self, events: List[dict]):
+        for subscriber in list(self._subscribers):
+            for event in events:
+                try:
+                    subscriber.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Slow consumer: drop it; it resumes from its last offset.
+                    subscriber.overflowed = True
+                    self._subscribers.discard(subscriber)
+                    metrics.incr("revocation_feed.overflow_disconnects")
+                    break
+
+    async def _advance_horizon(self):
+        # Sequence values are handed out at insert time, not commit time, so
+        # an id can become visible before a smaller one. Only ids allocated
+        # before a snapshot whose transactions have all finished are published.
+        if engine.dialect.name != "postgresql":
+            return
+
+        xmin, xmax, last_value = await asyncio.to_thread(_snapshot_marker)
+        self._markers.append((xmax, last_value))
+        while self._markers and self._markers[0][0] <= xmin:
+            self._horizon = self._markers.popleft()[1]
+        metrics.set_gauge("revocation_feed.unsettled_markers", len(self._markers))
+
+    async def ensure_offset(self):
+        # Live delivery starts from the settled horizon when the feed starts;
+        # each subscriber reads its own backlog up to the horizon, so nothing
+        # falls between backlog and live events. Revocations younger than an
+        # access token's lifetime are replayed into the revoked-token list.
+        async with self._offset_lock:
+            if self._last_offset is not None:
+                return
+
+            if engine.dialect.name == "postgresql":
+                self._markers.clear()
+                await self._advance_horizon()
+                while self._markers:
+                    await asyncio.sleep(self.poll_interval_seconds)
+                    await self._advance_horizon()
+                self._last_offset = self._horizon or 0
+            else:
+                _, max_offset = await asyncio.to_thread(_offset_bounds)
+                self._last_offset = max_offset or 0
+
+            _apply_to_tokens(await asyncio.to_thread(_fetch_recent, self._last_offset))
+
+    async def _poll_once(self):
+        await self.ensure_offset()
+        await self._advance_horizon()
+        events = await asyncio.to_thread(_fetch_after, self._last_offset, self.batch_size, self._horizon)
+        if events:
+            self._last_offset = events[-1]["offset"]
+            _apply_to_tokens(events)
+            self._publish(events)
+            metrics.incr("revocation_feed.events_published", len(events))
+        return len(events)
+
+    async def _run(self):
+        last_purge = 0.0
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                fetched = await self._poll_once()
+                if loop.time() - last_purge > 3600:
+                    last_purge = loop.time()
+                    await asyncio.to_thread(_purge_expired)
+            except Exception as e:
+                fetched = 0
+                metrics.incr("revocation_feed.poll_errors")
+                logger.warning("Revocation feed poll failed", extra={"error": type(e).__name__})
+
+            if fetched < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def stream(self, request, since: Optional[int]):
+        subscriber = self.subscribe()
+        try:
+            await self.ensure_offset()
+            sent_offset = since
+            if since is not None:
+                min_offset, _ = await asyncio.to_thread(_offset_bounds)
+                if min_offset is not None and since < min_offset - 1:
+                    yield "event: reset\ndata: {}\n\n"
+
+                while True:
+                    backlog = await asyncio.to_thread(
+                        _fetch_after, sent_offset, self.batch_size, self._horizon
+                    )
+                    for event in backlog:
+                        yield f"id: {event['offset']}\nevent: revocation\ndata: {json.dumps(event)}\n\n"
+                        sent_offset = event["offset"]
+                    if len(backlog) < self.batch_size:
+                        break
+
+            while not subscriber.overflowed:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(),
+                        settings.REVOCATION_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if sent_offset is not None and event["offset"] <= sent_offset:
+                    continue
+                yield f"id: {event['offset']}\nevent: revocation\ndata: {json.dumps(event)}\n\n"
+                sent_offset = event["offset"]
+        finally:
+            self.unsubscribe(subscriber)
+
+
+revocation_feed = RevocationFeed(settings.REVOCATION_FEED_POLL_SECONDS)
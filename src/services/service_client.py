@@ -0,0 +1,64 @@
+import secrets
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from src.models.user import ServiceClient
+from src.utils.security import (
+    create_service_token,
+    generate_client_secret,
+    hash_client_secret,
+    verify_client_secret
+)
+from src.utils.tracing import traced
+from src.config import get_settings
+
+settings = get_settings()
+
+
+class ServiceClientService:
+    @staticmethod
+    @traced("ServiceClientService.register_client")
+    def register_client(db: Session, name: str, scopes: list):
+        client_id = f"svc_{secrets.token_hex(8)}"
+        client_secret = generate_client_secret()
+
+        client = ServiceClient(
+            client_id=client_id,
+            secret_hash=hash_client_secret(client_secret),
+            name=name,
+            scopes=" ".join(scopes)
+        )
+        db.add(client)
+        db.commit()
+
+        return {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "name": name,
+            "scopes": scopes
+        }
+
+    @staticmethod
+    @traced("ServiceClientService.issue_token")
+    def issue_token(db: Session, client_id: str, client_secret: str, scope: str = None):
+        client = db.query(ServiceClient).filter(ServiceClient.client_id == client_id).first()
+
+        if not client or not client.is_active or not verify_client_secret(client_secret, client.secret_hash):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid client credentials"
+            )
+
+        allowed = client.scopes.split()
+        requested = scope.split() if scope else allowed
+        if not set(requested).issubset(allowed):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Requested scope not allowed for this client"
+            )
+
+        return {
+            "access_token": create_service_token(client.client_id, requested),
+            "token_type": "bearer",
+            "expires_in": settings.SERVICE_TOKEN_EXPIRE_MINUTES * 60,
+            "scope": " ".join(requested)
+        }
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+from typing import Optional
+from fastapi import HTTPException
+from src.config import get_settings
+from src.database import ReadSessions
+from src.dependencies.auth import resolve_token_user
+from src.utils.ids import external_id
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+MAX_LINE_BYTES = 8192
+
+
+async def verify_token(token: str) -> dict:
+    reads = ReadSessions()
+    try:
+        payload, user = await resolve_token_user(token, reads)
+    except HTTPException as e:
+        return {"valid": False, "status": e.status_code, "error": e.detail}
+    finally:
+        reads.close()
+
+    return {
+        "valid": bool(user.is_active),
+        "user_id": external_id(user.id),
+        "verified": bool(user.is_verified),
+        "active": bool(user.is_active),
+        "exp": payload.get("exp"),
+        "sid": external_id(payload.get("sid")),
+    }
+
+
+class TokenVerifySocketServer:
+    def __init__(self, path: str):
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(b'{"valid":false,"error":"request too large"}\n')
+                    break
+
+                token = line.strip().decode("ascii", errors="ignore")
+                if token.lower().startswith("bearer "):
+                    token = token[7:]
+
+                result = await verify_token(token) if token else {"valid": False, "error": "empty token"}
+                metrics.incr("token_socket.verifications")
+                writer.write(json.dumps(result, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except Exception as e:
+            logger.warning("Token socket connection error", extra={"error": type(e).__name__})
+        finally:
+            writer.close()
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=MAX_LINE_BYTES)
+        os.chmod(self.path, settings.TOKEN_VERIFY_SOCKET_MODE)
+        logger.info("Token verification socket listening", extra={"path": self.path})
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+token_socket_server = (
+    TokenVerifySocketServer(settings.TOKEN_VERIFY_SOCKET_PATH.format(pid=os.getpid()))
+    if settings.TOKEN_VERIFY_SOCKET_PATH else None
+)
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from src.models.user import User
+from src.utils.ids import external_id
+from src.config import get_settings
+from src.utils.metrics import metrics
+from src.utils.tracing import traced
+
+settings = get_settings()
+
+
+class UserDirectory:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._profiles: "OrderedDict[int, tuple]" = OrderedDict()
+        self._ids_by_email: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def to_profile(user: User) -> dict:
+        return {
+            "id": external_id(user.id),
+            "email": user.email,
+            "full_name": user.full_name,
+            "is_active": user.is_active,
+            "is_verified": user.is_verified,
+            "auth_provider": user.auth_provider.value if user.auth_provider else None,
+        }
+
+    def _remove(self, user_id: int):
+        profile, _ = self._profiles.pop(user_id)
+        if self._ids_by_email.get(profile["email"]) == user_id:
+            del self._ids_by_email[profile["email"]]
+
+    def _get(self, user_id: int, now: float) -> Optional[dict]:
+        entry = self._profiles.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            self._remove(user_id)
+            return None
+        self._profiles.move_to_end(user_id)
+        return entry[0]
+
+    def _put(self, user_id: int, profile: dict, now: float):
+        if self.max_entries <= 0:
+            return
+        if user_id in self._profiles:
+            self._remove(user_id)
+        self._profiles[user_id] = (profile, now + self.ttl_seconds)
+        self._ids_by_email[profile["email"]] = user_id
+        while len(self._profiles) > self.max_entries:
+            self._remove(next(iter(self._profiles)))
+            metrics.incr("user_directory.evictions")
+
+    def invalidate(self, user_id: Optional[int] = None, email: Optional[str] = None):
+        with self._lock:
+            if user_id is None and email is not None:
+                user_id = self._ids_by_email.get(email)
+            if user_id in self._profiles:
+                self._remove(user_id)
+
+    @traced("UserDirectory.lookup")
+    def lookup(self, db: Session, ids: List[int], emails: List[str]) -> Tuple[List[dict], List[int], List[str]]:
+        ids = list(dict.fromkeys(ids))
+        emails = list(dict.fromkeys(emails))
+        now = time.monotonic()
+        found: Dict[int, dict] = {}
+        pending_ids, pending_emails = [], []
+
+        with self._lock:
+            for user_id in ids:
+                profile = self._get(user_id, now)
+                if profile is None:
+                    pending_ids.append(user_id)
+                else:
+                    found[user_id] = profile
+            for email in emails:
+                user_id = self._ids_by_email.get(email)
+                profile = self._get(user_id, now) if user_id is not None else None
+                if profile is None:
+                    pending_emails.append(email)
+                else:
+                    found[user_id] = profile
+
+        metrics.incr("user_directory.cache_hits", len(ids) + len(emails) - len(pending_ids) - len(pending_emails))
+        metrics.incr("user_directory.cache_misses", len(pending_ids) + len(pending_emails))
+
+        if pending_ids or pending_emails:
+            conditions = []
+            if pending_ids:
+                conditions.append(User.id.in_(pending_ids))
+            if pending_emails:
+                conditions.append(User.email.in_(pending_emails))
+
+            users = db.query(User).filter(or_(*conditions)).all()
+            metrics.incr("user_directory.db_lookups")
+
+            with self._lock:
+                for user in users:
+                    profile = self.to_profile(user)
+                    found[user.id] = profile
+                    self._put(user.id, profile, now)
+
+        found_emails = {profile["email"] for profile in found.values()}
+        missing_ids = [user_id for user_id in ids if user_id not in found]
+        missing_emails = [email for email in emails if email not in found_emails]
+        return list(found.values()), missing_ids, missing_emails
+
+    def size(self) -> int:
+        return len(self._profiles)
+
+
+user_directory = UserDirectory(settings.USER_DIRECTORY_CACHE_MAX_ENTRIES, settings.USER_DIRECTORY_CACHE_TTL_SECONDS)
+metrics.register_gauge("user_directory.entries", user_directory.size)
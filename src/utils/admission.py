@@ -0,0 +1,125 @@
+import asyncio
+import math
+import time
+from typing import Dict, Optional
+from src.config import get_settings
+from src.utils.metrics import metrics
+
+settings = get_settings()
+
+EXPENSIVE_PATHS = {
+    "/api/v1/auth/login",
+    "/api/v1/auth/register",
+    "/api/v1/auth/reset-password",
+    "/api/v1/auth/reset-password/magic",
+}
+
+
+class AdmissionClass:
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: Optional[int],
+        max_queue: int,
+        max_wait_seconds: float,
+        target_wait_seconds: float = 0.0,
+        interval_seconds: float = 0.5
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.target_wait_seconds = target_wait_seconds
+        self.interval_seconds = interval_seconds
+        self.in_flight = 0
+        self.waiting = 0
+        self.overloaded = False
+        self._semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self._window_start = time.monotonic()
+        self._window_min = math.inf
+
+        metrics.register_gauge(f"admission.{name}.in_flight", lambda: self.in_flight)
+        metrics.register_gauge(f"admission.{name}.waiting", lambda: self.waiting)
+        metrics.register_gauge(f"admission.{name}.overloaded", lambda: 1 if self.overloaded else 0)
+
+    def _roll_window(self, now: float):
+        # CoDel-style: if even the shortest queue wait over a whole interval
+        # stayed above target, the queue is standing rather than absorbing a
+        # burst, so new arrivals are shed instead of queued.
+        if now - self._window_start < self.interval_seconds:
+            return
+        if self._window_min == math.inf:
+            self.overloaded = self.overloaded and self.waiting > 0
+        else:
+            self.overloaded = self._window_min > self.target_wait_seconds
+        self._window_start = now
+        self._window_min = math.inf
+
+    def _observe_wait(self, wait_seconds: float):
+        self._window_min = min(self._window_min, wait_seconds)
+        metrics.observe(f"admission.{self.name}.queue_wait_ms", wait_seconds * 1000)
+
+    async def acquire(self) -> bool:
+        if self._semaphore is None:
+            self.in_flight += 1
+            return True
+
+        start = time.monotonic()
+        if self.target_wait_seconds > 0:
+            self._roll_window(start)
+
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                metrics.incr(f"admission.{self.name}.shed_queue_full")
+                return False
+            if self.overloaded:
+                metrics.incr(f"admission.{self.name}.shed_overloaded")
+                return False
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                self._observe_wait(time.monotonic() - start)
+                metrics.incr(f"admission.{self.name}.shed_timeout")
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self._observe_wait(time.monotonic() - start)
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+class AdmissionController:
+    def __init__(self):
+        self.classes: Dict[str, AdmissionClass] = {
+            "expensive": AdmissionClass(
+                "expensive",
+                settings.SHED_EXPENSIVE_MAX_IN_FLIGHT,
+                settings.SHED_EXPENSIVE_MAX_QUEUE,
+                settings.SHED_EXPENSIVE_MAX_WAIT_MS / 1000,
+                settings.SHED_EXPENSIVE_TARGET_WAIT_MS / 1000,
+                settings.SHED_INTERVAL_MS / 1000,
+            ),
+            "cheap": AdmissionClass("cheap", None, 0, 0),
+        }
+
+    @staticmethod
+    def classify(method: str, path: str) -> str:
+        if method == "POST" and path.rstrip("/") in EXPENSIVE_PATHS:
+            return "expensive"
+        return "cheap"
+
+    def get(self, method: str, path: str) -> AdmissionClass:
+        return self.classes[self.classify(method, path)]
+
+
+admission = AdmissionController()
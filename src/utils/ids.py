@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy import text
+from src.config import get_settings
+
+settings = get_settings()
+
+# 2026-01-01T00:00:00Z; 41 bits of milliseconds from here last ~69 years.
+EPOCH_MS = 1767225600000
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeGenerator:
+    def __init__(self, worker_id: int):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+
+        self.worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms < self._last_ms:
+                # Clock moved backwards; keep issuing from the last timestamp.
+                now_ms = self._last_ms
+
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    while now_ms <= self._last_ms:
+                        now_ms = int(time.time() * 1000)
+            else:
+                self._sequence = 0
+
+            self._last_ms = now_ms
+            return ((now_ms - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+
+def id_timestamp_ms(value: int) -> int:
+    return (value >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS
+
+
+class LazySnowflakeGenerator:
+    def __init__(self, resolve_worker_id: Callable[[], int]):
+        self._resolve_worker_id = resolve_worker_id
+        self._generator: Optional[SnowflakeGenerator] = None
+        self._lock = threading.Lock()
+
+    @property
+    def worker_id(self) -> int:
+        if self._generator is None:
+            with self._lock:
+                if self._generator is None:
+                    self._generator = SnowflakeGenerator(self._resolve_worker_id())
+        return self._generator.worker_id
+
+    def next_id(self) -> int:
+        if self._generator is None:
+            self.worker_id
+        return self._generator.next_id()
+
+
+class WorkerIdLease:
+    LOCK_NAMESPACE = 0x51D
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.worker_id: Optional[int] = None
+        self._conn = None
+
+    def acquire(self) -> int:
+        # Session-level advisory locks live as long as the connection, so a
+        # crashed process frees its worker id without any cleanup.
+        conn = self.engine.connect()
+        for worker_id in range(MAX_WORKER_ID + 1):
+            locked = conn.execute(
+                text("SELECT pg_try_advisory_lock(:namespace, :worker_id)"),
+                {"namespace": self.LOCK_NAMESPACE, "worker_id": worker_id}
+            ).scalar()
+            if locked:
+                conn.commit()
+                self._conn = conn
+                self.worker_id = worker_id
+                return worker_id
+
+        conn.close()
+        raise RuntimeError(f"All {MAX_WORKER_ID + 1} snowflake worker ids are leased")
+
+    def release(self):
+        if self._conn is not None:
+            # Invalidate rather than return to the pool, which would keep the lock.
+            self._conn.invalidate()
+            self._conn.close()
+            self._conn = None
+            self.worker_id = None
+
+
+def external_id(value: Optional[int]):
+    # Snowflake ids exceed 2^53 and lose precision as JSON numbers in JavaScript.
+    if value is not None and settings.ID_STRATEGY == "snowflake":
+        return str(value)
+    return value
@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from src.config import get_settings
+from src.utils.logger import get_logger, request_id_var, request_route_var
+from src.utils.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+def _task_context(task: asyncio.Task):
+    get_context = getattr(task, "get_context", None)
+    if get_context is not None:
+        return get_context()
+    return getattr(task, "_context", None)
+
+
+class LoopLagMonitor:
+    def __init__(self, interval_seconds: float, threshold_ms: float):
+        self.interval_seconds = interval_seconds
+        self.threshold_ms = threshold_ms
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            lag_ms = max(0.0, (now - expected) * 1000)
+            self._heartbeat = now
+
+            metrics.observe("event_loop.lag_ms", lag_ms)
+            metrics.set_gauge("event_loop.lag_ms_current", round(lag_ms, 3))
+            if lag_ms >= self.threshold_ms:
+                metrics.incr("event_loop.lag_threshold_exceeded")
+
+    def _blocking_request(self, frame):
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        context = _task_context(task) if task is not None else None
+        if context is not None and context.get(request_id_var):
+            return context.get(request_id_var), context.get(request_route_var)
+
+        # Task contexts are not readable here before Python 3.12, so fall back
+        # to the ASGI scope held by a frame on the blocked stack.
+        while frame is not None:
+            scope = frame.f_locals.get("scope")
+            if isinstance(scope, dict) and scope.get("type") == "http":
+                state = scope.get("state") or {}
+                return state.get("request_id"), f"{scope.get('method')} {scope.get('path')}"
+            frame = frame.f_back
+        return None, None
+
+    def _watch(self):
+        threshold_seconds = self.threshold_ms / 1000
+        while not self._stop.wait(self.interval_seconds):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval_seconds
+            if stalled_for < threshold_seconds or self._reported_heartbeat == heartbeat:
+                continue
+
+            self._reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            try:
+                request_id, route = self._blocking_request(frame)
+            except Exception:
+                request_id, route = None, None
+            metrics.incr("event_loop.blocking_captures")
+            logger.warning(
+                "Event loop blocked",
+                extra={
+                    "blocked_ms": round(stalled_for * 1000, 1),
+                    "request_id": request_id,
+                    "route": route,
+                    "stack": "".join(traceback.format_stack(frame, limit=30)),
+                }
+            )
+
+    def start(self):
+        if self._task is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+loop_monitor = LoopLagMonitor(
+    settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    settings.LOOP_LAG_THRESHOLD_MS,
+)
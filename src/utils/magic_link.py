@@ -0,0 +1,50 @@
+import hashlib
+import hmac
+from typing import Optional
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from src.config import get_settings
+
+settings = get_settings()
+
+
+def _serializer(purpose: str) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(settings.SECRET_KEY, salt=f"magic-link:{purpose}")
+
+
+def user_fingerprint(user, purpose: str) -> str:
+    # Any change to the password hash or verification state invalidates
+    # outstanding links, which is what makes them single-use.
+    material = f"{purpose}|{user.id}|{user.hashed_password or ''}|{bool(user.is_verified)}"
+    return hashlib.sha256(material.encode()).hexdigest()[:32]
+
+
+def create_magic_token(user, purpose: str) -> str:
+    return _serializer(purpose).dumps({
+        "email": user.email,
+        "purpose": purpose,
+        "fp": user_fingerprint(user, purpose),
+    })
+
+
+def load_magic_token(token: str, purpose: str) -> Optional[dict]:
+    try:
+        payload = _serializer(purpose).loads(token, max_age=settings.MAGIC_LINK_EXPIRE_MINUTES * 60)
+    except (BadSignature, SignatureExpired):
+        return None
+
+    if payload.get("purpose") != purpose:
+        return None
+    return payload
+
+
+def fingerprint_matches(user, payload: dict) -> bool:
+    return hmac.compare_digest(user_fingerprint(user, payload["purpose"]), payload.get("fp", ""))
+
+
+def magic_link_enabled(purpose: str) -> bool:
+    return purpose in {flow.strip() for flow in settings.MAGIC_LINK_FLOWS.split(",") if flow.strip()}
+
+
+def build_magic_link(token: str, purpose: str) -> str:
+    path = "verify-email" if purpose == "email_verification" else "reset-password"
+    return f"{settings.FRONTEND_URL}/auth/{path}?token={token}"
@@ -0,0 +1,54 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._gauge_callbacks: Dict[str, Callable[[], float]] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_gauge(self, name: str, callback: Callable[[], float]):
+        with self._lock:
+            self._gauge_callbacks[name] = callback
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = {"count": 0, "sum": 0.0, "max": 0.0}
+            timing["count"] += 1
+            timing["sum"] += value
+            timing["max"] = max(timing["max"], value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            callbacks = dict(self._gauge_callbacks)
+            timings = {
+                name: {**timing, "avg": timing["sum"] / timing["count"] if timing["count"] else 0.0}
+                for name, timing in self._timings.items()
+            }
+
+        for name, callback in callbacks.items():
+            try:
+                gauges[name] = callback()
+            except Exception:
+                gauges[name] = None
+
+        return {"counters": counters, "gauges": gauges, "timings": timings}
+
+
+metrics = Metrics()
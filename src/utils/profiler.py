@@ -0,0 +1,61 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def sample_stacks(duration_seconds: float, rate_hz: float, max_depth: int = 64, max_stacks: int = 20000) -> Dict[str, int]:
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+
+    try:
+        interval = 1.0 / rate_hz
+        own_thread = threading.get_ident()
+        thread_names = {}
+        stacks = Counter()
+        deadline = time.monotonic() + duration_seconds
+
+        while time.monotonic() < deadline:
+            tick = time.monotonic()
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+
+                if thread_id not in thread_names:
+                    thread_names.update({thread.ident: thread.name for thread in threading.enumerate()})
+                name = thread_names.get(thread_id, str(thread_id))
+
+                labels = []
+                while frame is not None and len(labels) < max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+
+                key = ";".join([name, *reversed(labels)])
+                if key in stacks or len(stacks) < max_stacks:
+                    stacks[key] += 1
+                else:
+                    stacks["[truncated]"] += 1
+
+            time.sleep(max(0.0, interval - (time.monotonic() - tick)))
+
+        return dict(stacks)
+    finally:
+        _profile_lock.release()
+
+
+def collapse(stacks: Dict[str, int]) -> str:
+    return "\n".join(f"{stack} {count}" for stack, count in sorted(stacks.items()))
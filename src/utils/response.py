@@ -1,6 +1,7 @@
 from fastapi import Response
 from datetime import datetime
 from typing import Any, Optional
+import hashlib
 import uuid
 
 
@@ -39,4 +40,25 @@ class APIResponse:
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             },
             "body": data
-        }
\ No newline at end of file
+        }
+
+
+def weak_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
@@ -1,22 +1,68 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from src.config import get_settings
+from src.utils.tracing import traced
+from src.utils.token_cache import RevokedTokens, TokenClaimsCache
+from src.utils.metrics import metrics
+import hashlib
+import hmac
 import secrets
+import time
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def build_pwd_context(
+    schemes: Optional[List[str]] = None,
+    bcrypt_rounds: Optional[int] = None,
+    argon2_time_cost: Optional[int] = None,
+    argon2_memory_cost: Optional[int] = None,
+    argon2_parallelism: Optional[int] = None,
+) -> CryptContext:
+    schemes = schemes or [s.strip() for s in settings.PASSWORD_HASH_SCHEMES.split(",") if s.strip()]
+    bcrypt_rounds = bcrypt_rounds or settings.BCRYPT_ROUNDS
+    options = {}
+
+    if "bcrypt" in schemes:
+        # Pinning min/max to the default makes needs_update() true for any
+        # stored hash whose cost differs, in either direction.
+        options.update({
+            "bcrypt__default_rounds": bcrypt_rounds,
+            "bcrypt__min_rounds": bcrypt_rounds,
+            "bcrypt__max_rounds": bcrypt_rounds,
+        })
+
+    if "argon2" in schemes:
+        options.update({
+            "argon2__time_cost": argon2_time_cost or settings.ARGON2_TIME_COST,
+            "argon2__memory_cost": argon2_memory_cost or settings.ARGON2_MEMORY_COST,
+            "argon2__parallelism": argon2_parallelism or settings.ARGON2_PARALLELISM,
+        })
+
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+
+pwd_context = build_pwd_context()
+
+
+@traced("password.verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@traced("password.verify_and_update")
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+@traced("password.hash")
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@traced("jwt.encode")
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -24,11 +70,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": round(time.time(), 3), "type": "access"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+@traced("jwt.encode")
 def create_refresh_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
@@ -37,6 +84,20 @@ def create_refresh_token(data: dict):
     return encoded_jwt
 
 
+@traced("jwt.encode")
+def create_service_token(client_id: str, scopes: List[str]):
+    expire = datetime.utcnow() + timedelta(minutes=settings.SERVICE_TOKEN_EXPIRE_MINUTES)
+    to_encode = {
+        "sub": f"client:{client_id}",
+        "client_id": client_id,
+        "scope": " ".join(scopes),
+        "exp": expire,
+        "type": "service",
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+@traced("jwt.decode")
 def decode_token(token: str):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -45,5 +106,41 @@ def decode_token(token: str):
         return None
 
 
+token_claims_cache = TokenClaimsCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+metrics.register_gauge("token_cache.hit_rate", lambda: token_claims_cache.stats()["hit_rate"])
+metrics.register_gauge("token_cache.entries", lambda: token_claims_cache.stats()["entries"])
+metrics.register_gauge("token_cache.approx_bytes", lambda: token_claims_cache.stats()["approx_bytes"])
+
+revoked_tokens = RevokedTokens(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+metrics.register_gauge("token_cache.revocations", revoked_tokens.size)
+
+
+def decode_token_cached(token: str):
+    payload = token_claims_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        if payload is not None:
+            token_claims_cache.put(token, payload)
+
+    if payload is not None and revoked_tokens.is_revoked(payload):
+        metrics.incr("token_cache.revoked_rejections")
+        return None
+    return payload
+
+
 def generate_otp() -> str:
-    return str(secrets.randbelow(1000000)).zfill(6)
\ No newline at end of file
+    return str(secrets.randbelow(1000000)).zfill(6)
+
+
+def generate_client_secret() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def hash_client_secret(client_secret: str) -> str:
+    # Client secrets are random 256-bit values, so a keyed hash is enough;
+    # bcrypt's work factor only matters for low-entropy human passwords.
+    return hmac.new(settings.SECRET_KEY.encode(), client_secret.encode(), hashlib.sha256).hexdigest()
+
+
+def verify_client_secret(client_secret: str, secret_hash: str) -> bool:
+    return hmac.compare_digest(hash_client_secret(client_secret), secret_hash)
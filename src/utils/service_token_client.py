@@ -0,0 +1,60 @@
+import asyncio
+import time
+from typing import Optional
+import httpx
+
+
+class ServiceTokenClient:
+    def __init__(
+        self,
+        base_url: str,
+        client_id: str,
+        client_secret: str,
+        scope: Optional[str] = None,
+        refresh_margin_seconds: float = 30.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.token_url = f"{base_url.rstrip('/')}/api/v1/auth/token"
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._http = http_client or httpx.AsyncClient(timeout=5.0)
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and time.monotonic() < self._expires_at - self.refresh_margin_seconds
+
+    async def get_token(self) -> str:
+        if self._is_fresh():
+            return self._token
+
+        async with self._lock:
+            if self._is_fresh():
+                return self._token
+
+            response = await self._http.post(self.token_url, json={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": self.scope,
+            })
+            envelope = response.json()
+            body = envelope.get("body") or {}
+            if envelope["header"]["responseCode"] != 200 or "access_token" not in body:
+                raise RuntimeError(f"Token request failed: {envelope['header']['responseMessage']}")
+
+            self._token = body["access_token"]
+            self._expires_at = time.monotonic() + body["expires_in"]
+            return self._token
+
+    async def auth_headers(self) -> dict:
+        return {"Authorization": f"Bearer {await self.get_token()}"}
+
+    def invalidate(self):
+        self._token = None
+
+    async def aclose(self):
+        await self._http.aclose()
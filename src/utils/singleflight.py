@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from src.utils.metrics import metrics
+
+
+def _retrieve_exception(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            metrics.incr(f"singleflight.{self.name}.coalesced")
+        else:
+            # The call runs detached from whichever request started it, so a
+            # cancelled caller never cancels the result other callers await.
+            task = asyncio.ensure_future(fn())
+            task.add_done_callback(_retrieve_exception)
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._calls[key] = task
+            metrics.incr(f"singleflight.{self.name}.executed")
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from src.utils.metrics import metrics
+
+
+class TokenClaimsCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _remove(self, digest: bytes):
+        _, _, size = self._entries.pop(digest)
+        self._bytes -= size
+
+    def get(self, token: str) -> Optional[dict]:
+        if self.max_entries <= 0:
+            return None
+
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry[1] <= time.time():
+                self._remove(digest)
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, token: str, claims: dict):
+        exp = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+
+        digest = self._digest(token)
+        size = len(digest) + len(json.dumps(claims, default=str))
+        with self._lock:
+            if digest in self._entries:
+                self._remove(digest)
+            self._entries[digest] = (claims, exp, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                metrics.incr("token_cache.evictions")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approx_bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class RevokedTokens:
+    def __init__(self, token_lifetime_seconds: float):
+        self.token_lifetime_seconds = token_lifetime_seconds
+        self._sessions: Dict[tuple, float] = {}
+        self._user_cutoffs: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._pruned_at = 0.0
+
+    def _prune(self, now: float):
+        # Every token issued before a revocation has expired one lifetime later.
+        if now - self._pruned_at < 60:
+            return
+        self._pruned_at = now
+        self._sessions = {key: until for key, until in self._sessions.items() if until > now}
+        self._user_cutoffs = {key: entry for key, entry in self._user_cutoffs.items() if entry[1] > now}
+
+    def revoke_session(self, user_id, session_id, revoked_at: Optional[float] = None):
+        now = time.time()
+        until = (revoked_at or now) + self.token_lifetime_seconds
+        with self._lock:
+            self._prune(now)
+            key = (str(user_id), str(session_id))
+            self._sessions[key] = max(self._sessions.get(key, 0.0), until)
+
+    def revoke_user(self, user_id, revoked_at: Optional[float] = None):
+        now = time.time()
+        cutoff = revoked_at or now
+        with self._lock:
+            self._prune(now)
+            current = self._user_cutoffs.get(str(user_id))
+            if current is None or current[0] < cutoff:
+                self._user_cutoffs[str(user_id)] = (cutoff, cutoff + self.token_lifetime_seconds)
+
+    def is_revoked(self, claims: dict) -> bool:
+        user_id = str(claims.get("sub"))
+        with self._lock:
+            if (user_id, str(claims.get("sid"))) in self._sessions:
+                return True
+
+            entry = self._user_cutoffs.get(user_id)
+            if entry is None:
+                return False
+
+        issued_at = claims.get("iat")
+        if not isinstance(issued_at, (int, float)):
+            issued_at = claims.get("exp", 0) - self.token_lifetime_seconds
+        return issued_at < entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._user_cutoffs.clear()
+
+    def size(self) -> int:
+        return len(self._sessions) + len(self._user_cutoffs)
@@ -0,0 +1,181 @@
+import contextvars
+import functools
+import inspect
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+from src.config import get_settings
+from src.utils.metrics import metrics
+
+settings = get_settings()
+
+current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, **attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.end = time.time()
+        if error is not None:
+            self.status = "error"
+            self.attributes["error"] = type(error).__name__
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.time()) - self.start) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class NoopSpanExporter:
+    def export(self, span: Span):
+        pass
+
+
+class InMemorySpanExporter:
+    def __init__(self, max_spans: int = 10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self.spans.append(span.to_dict())
+
+    def get_trace(self, trace_id: str) -> list:
+        return [span for span in list(self.spans) if span["trace_id"] == trace_id]
+
+    def clear(self):
+        self.spans.clear()
+
+
+class FileSpanExporter:
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            metrics.incr("tracing.dropped_spans")
+
+    def _run(self):
+        with open(self.path, "a", buffering=1) as f:
+            while True:
+                f.write(json.dumps(self._queue.get(), default=str) + "\n")
+
+
+@lru_cache()
+def get_exporter():
+    exporter = settings.TRACING_EXPORTER
+    if exporter == "memory":
+        return InMemorySpanExporter()
+    if exporter == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    return NoopSpanExporter()
+
+
+@lru_cache()
+def tracing_active() -> bool:
+    # With nowhere to send spans, skip building them at all.
+    return settings.TRACING_ENABLED and not isinstance(get_exporter(), NoopSpanExporter)
+
+
+def start_span(name: str, trace_id: Optional[str] = None, **attributes) -> Optional[Span]:
+    parent = current_span.get()
+    if parent is None and trace_id is None:
+        return None
+    if parent is not None:
+        return Span(name, parent.trace_id, parent.span_id, **attributes)
+    return Span(name, trace_id, **attributes)
+
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None):
+    if span is None:
+        return
+    span.finish(error)
+    get_exporter().export(span)
+
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, **attributes):
+    active = start_span(name, trace_id, **attributes) if tracing_active() else None
+    if active is None:
+        yield None
+        return
+
+    token = current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        end_span(active, e)
+        raise
+    else:
+        end_span(active)
+    finally:
+        current_span.reset(token)
+
+
+def traced(name: str):
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_engine(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and tracing_active():
+            context._trace_span = start_span("db.query", statement=statement[:200])
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        end_span(getattr(context, "_trace_span", None))
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        context = exception_context.execution_context
+        end_span(getattr(context, "_trace_span", None), exception_context.original_exception)
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="identity-tests-")
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("SMTP_HOST", "localhost")
+os.environ.setdefault("SMTP_PORT", "1025")
+os.environ.setdefault("SMTP_USERNAME", "test")
+os.environ.setdefault("SMTP_PASSWORD", "test")
+os.environ.setdefault("FROM_EMAIL", "noreply@example.com")
+os.environ.setdefault("FROM_NAME", "Identity Service")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("GOOGLE_REDIRECT_URI", "http://testserver/api/v1/auth/google/callback")
+os.environ.setdefault("GOOGLE_DISCOVERY_URL", "https://accounts.fake-google.test/.well-known/openid-configuration")
+os.environ.setdefault("FRONTEND_URL", "http://frontend.test")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("LOOP_MONITOR_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.database import Base, SessionLocal, engine
+from src.utils.security import revoked_tokens
+
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+    # Ids restart with every schema, so revocations must not leak across tests.
+    revoked_tokens.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import httpx
+from fastapi import HTTPException, status
+
+from main import app
+from src.config import get_settings
+from src.services.auth import AuthService
+from src.utils.admission import AdmissionClass, admission
+
+settings = get_settings()
+
+LOGIN = {"email": "someone@example.com", "password": "Password123!"}
+
+
+def slow_login(*args, **kwargs):
+    # Stands in for bcrypt: blocking CPU work that must stay off the event loop.
+    time.sleep(0.3)
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+
+def test_cheap_requests_complete_while_expensive_ones_are_saturated(monkeypatch):
+    monkeypatch.setattr(settings, "SHED_ENABLED", True)
+    monkeypatch.setattr(AuthService, "login_user", staticmethod(slow_login))
+
+    async def scenario():
+        monkeypatch.setitem(admission.classes, "expensive", AdmissionClass("test_expensive", 2, 0, 1.0))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            logins = [
+                asyncio.create_task(client.post("/api/v1/auth/login", json=LOGIN))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+
+            started = time.monotonic()
+            health = await client.get("/health")
+            cheap_elapsed = time.monotonic() - started
+
+            shed = await client.post("/api/v1/auth/login", json=LOGIN)
+            admitted = await asyncio.gather(*logins)
+        return health, cheap_elapsed, shed, admitted
+
+    health, cheap_elapsed, shed, admitted = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert cheap_elapsed < 0.2
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == str(settings.SHED_RETRY_AFTER_SECONDS)
+    assert [response.json()["header"]["responseCode"] for response in admitted] == [401, 401]
+
+
+def test_standing_queue_sheds_new_arrivals_without_waiting():
+    async def scenario():
+        expensive = AdmissionClass("test_expensive", 1, 10, 1.0, target_wait_seconds=0.01, interval_seconds=0.05)
+        assert await expensive.acquire()
+        await asyncio.sleep(0.06)
+
+        waiter = asyncio.create_task(expensive.acquire())
+        await asyncio.sleep(0.1)
+        expensive.release()
+        assert await waiter
+
+        # The only wait observed in the last interval exceeded the target.
+        await asyncio.sleep(0.06)
+        started = time.monotonic()
+        admitted = await expensive.acquire()
+        return admitted, time.monotonic() - started, expensive.overloaded
+
+    admitted, elapsed, overloaded = asyncio.run(scenario())
+
+    assert not admitted
+    assert overloaded
+    assert elapsed < 0.05
@@ -0,0 +1,223 @@
+import secrets
+import time
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+import rsa
+from jose import jwk, jwt
+
+from src.config import get_settings
+from src.models.user import AuthProvider, User
+from src.services.google_oauth import google_metadata
+from src.utils import http
+from src.utils.security import get_password_hash
+
+settings = get_settings()
+
+ISSUER = "https://accounts.fake-google.test"
+
+
+class FakeGoogleProvider:
+    def __init__(self):
+        self.keys = {}
+        self.codes = {}
+        self.algorithm = "RS256"
+        self.signing_kid = self.rotate_key()
+
+    def rotate_key(self) -> str:
+        _, private_key = rsa.newkeys(1024)
+        kid = secrets.token_hex(4)
+        self.keys[kid] = private_key.save_pkcs1().decode()
+        self.signing_kid = kid
+        return kid
+
+    def issue_code(self, **claims) -> str:
+        now = int(time.time())
+        code = secrets.token_urlsafe(8)
+        self.codes[code] = {
+            "iss": ISSUER,
+            "aud": settings.GOOGLE_CLIENT_ID,
+            "iat": now,
+            "exp": now + 300,
+            **claims,
+        }
+        return code
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/.well-known/openid-configuration":
+            return httpx.Response(200, json={
+                "issuer": ISSUER,
+                "authorization_endpoint": f"{ISSUER}/o/oauth2/v2/auth",
+                "token_endpoint": f"{ISSUER}/token",
+                "jwks_uri": f"{ISSUER}/certs",
+            })
+
+        if request.url.path == "/certs":
+            return httpx.Response(200, json={"keys": [
+                {**jwk.construct(pem, "RS256").public_key().to_dict(), "kid": kid, "use": "sig"}
+                for kid, pem in self.keys.items()
+            ]})
+
+        if request.url.path == "/token":
+            form = parse_qs(request.content.decode())
+            claims = self.codes.pop(form["code"][0], None)
+            if claims is None or form["client_secret"][0] != settings.GOOGLE_CLIENT_SECRET:
+                return httpx.Response(400, json={"error": "invalid_grant"})
+
+            id_token = jwt.encode(
+                claims,
+                self.keys[self.signing_kid],
+                algorithm=self.algorithm,
+                headers={"kid": self.signing_kid}
+            )
+            return httpx.Response(200, json={"id_token": id_token, "token_type": "Bearer"})
+
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeGoogleProvider()
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(fake.handle)))
+    monkeypatch.setattr(google_metadata, "discovery", None)
+    monkeypatch.setattr(google_metadata, "jwks", {})
+    monkeypatch.setattr(google_metadata, "min_forced_refresh_seconds", 0.0)
+    return fake
+
+
+def start_login(client) -> str:
+    response = client.get("/api/v1/auth/google/login", follow_redirects=False)
+    assert response.status_code == 307
+
+    location = urlparse(response.headers["location"])
+    assert location.netloc == "accounts.fake-google.test"
+    params = parse_qs(location.query)
+    assert params["client_id"] == [settings.GOOGLE_CLIENT_ID]
+    return params["state"][0], params["nonce"][0]
+
+
+def finish_login(client, code: str, state: str) -> dict:
+    response = client.get(
+        "/api/v1/auth/google/callback",
+        params={"code": code, "state": state},
+        follow_redirects=False
+    )
+    assert response.status_code == 307
+    location = urlparse(response.headers["location"])
+    return {"path": location.path, "params": {k: v[0] for k, v in parse_qs(location.query).items()}}
+
+
+def google_login(client, provider, **claims) -> dict:
+    state, nonce = start_login(client)
+    code = provider.issue_code(nonce=nonce, **claims)
+    return finish_login(client, code, state)
+
+
+def test_new_google_user_is_created_active_and_verified(client, provider, db):
+    result = google_login(
+        client, provider,
+        sub="google-1", email="New.User@Example.com", email_verified=True, name="New User"
+    )
+
+    assert result["path"] == "/auth/callback"
+    assert result["params"]["access_token"]
+    assert result["params"]["refresh_token"]
+
+    user = db.query(User).filter(User.google_id == "google-1").one()
+    assert user.email == "new.user@example.com"
+    assert user.auth_provider == AuthProvider.GOOGLE
+    assert user.is_active and user.is_verified
+
+    me = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {result['params']['access_token']}"})
+    assert me.status_code == 200
+    assert me.json()["body"]["email"] == "new.user@example.com"
+
+
+def test_linking_unverified_local_account_activates_it_and_clears_password(client, provider, db):
+    db.add(User(
+        email="victim@example.com",
+        hashed_password=get_password_hash("attacker-chosen-password"),
+        auth_provider=AuthProvider.LOCAL,
+        is_active=False,
+        is_verified=False
+    ))
+    db.commit()
+
+    result = google_login(client, provider, sub="google-2", email="victim@example.com", email_verified=True)
+    assert result["path"] == "/auth/callback"
+
+    db.expire_all()
+    user = db.query(User).filter(User.email == "victim@example.com").one()
+    assert user.google_id == "google-2"
+    assert user.is_active and user.is_verified
+    assert user.hashed_password is None
+
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": "victim@example.com", "password": "attacker-chosen-password"}
+    )
+    assert login.json()["header"]["responseCode"] == 401
+
+
+def test_linking_verified_local_account_keeps_password(client, provider, db):
+    hashed_password = get_password_hash("owner-password")
+    db.add(User(
+        email="owner@example.com",
+        hashed_password=hashed_password,
+        auth_provider=AuthProvider.LOCAL,
+        is_active=True,
+        is_verified=True
+    ))
+    db.commit()
+
+    result = google_login(client, provider, sub="google-3", email="owner@example.com", email_verified=True)
+    assert result["path"] == "/auth/callback"
+
+    db.expire_all()
+    user = db.query(User).filter(User.email == "owner@example.com").one()
+    assert user.google_id == "google-3"
+    assert user.hashed_password == hashed_password
+    assert user.auth_provider == AuthProvider.LOCAL
+
+
+def test_unverified_google_email_is_rejected(client, provider, db):
+    result = google_login(client, provider, sub="google-4", email="unverified@example.com", email_verified=False)
+
+    assert result["path"] == "/auth/error"
+    assert "not verified" in result["params"]["message"]
+    assert db.query(User).count() == 0
+
+
+def test_nonce_mismatch_is_rejected(client, provider):
+    state, _ = start_login(client)
+    code = provider.issue_code(nonce="some-other-nonce", sub="google-5", email="n@example.com", email_verified=True)
+
+    result = finish_login(client, code, state)
+    assert result["path"] == "/auth/error"
+    assert "nonce" in result["params"]["message"]
+
+
+def test_state_mismatch_is_rejected(client, provider):
+    start_login(client)
+    code = provider.issue_code(nonce="unused", sub="google-6", email="s@example.com", email_verified=True)
+
+    result = finish_login(client, code, "forged-state")
+    assert result["path"] == "/auth/error"
+    assert result["params"]["message"] == "Invalid OAuth state"
+
+
+def test_rotated_signing_key_is_picked_up(client, provider):
+    google_login(client, provider, sub="google-7", email="rotate@example.com", email_verified=True)
+    provider.rotate_key()
+
+    result = google_login(client, provider, sub="google-7", email="rotate@example.com", email_verified=True)
+    assert result["path"] == "/auth/callback"
+
+
+def test_id_token_signed_with_another_algorithm_is_rejected(client, provider):
+    provider.algorithm = "RS384"
+
+    result = google_login(client, provider, sub="google-8", email="alg@example.com", email_verified=True)
+    assert result["path"] == "/auth/error"
+    assert result["params"]["message"] == "Invalid ID token"
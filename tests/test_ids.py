@@ -0,0 +1,56 @@
+import pytest
+
+from src.models import user as user_models
+from src.utils import ids
+from src.utils.ids import LazySnowflakeGenerator, SnowflakeGenerator, external_id, id_timestamp_ms
+
+
+def test_snowflake_ids_are_unique_and_carry_worker_id():
+    generator = SnowflakeGenerator(5)
+    values = [generator.next_id() for _ in range(10000)]
+
+    assert len(set(values)) == len(values)
+    assert values == sorted(values)
+    assert all((value >> ids.SEQUENCE_BITS) & ids.MAX_WORKER_ID == 5 for value in values)
+    assert id_timestamp_ms(values[0]) >= ids.EPOCH_MS
+
+
+def test_generators_with_different_worker_ids_never_collide():
+    first, second = SnowflakeGenerator(1), SnowflakeGenerator(2)
+    values = [generator.next_id() for _ in range(2000) for generator in (first, second)]
+
+    assert len(set(values)) == len(values)
+
+
+def test_lazy_generator_resolves_worker_id_once():
+    calls = []
+
+    def resolve():
+        calls.append(1)
+        return 7
+
+    generator = LazySnowflakeGenerator(resolve)
+    generator.next_id()
+    generator.next_id()
+
+    assert generator.worker_id == 7
+    assert len(calls) == 1
+
+
+def test_worker_id_is_required_without_a_lease_backend(monkeypatch):
+    monkeypatch.setattr(user_models.settings, "ID_WORKER_ID", None)
+
+    with pytest.raises(RuntimeError, match="ID_WORKER_ID"):
+        user_models.resolve_worker_id()
+
+    monkeypatch.setattr(user_models.settings, "ID_WORKER_ID", 3)
+    assert user_models.resolve_worker_id() == 3
+
+
+def test_external_id_is_a_string_only_for_snowflake_ids(monkeypatch):
+    monkeypatch.setattr(ids.settings, "ID_STRATEGY", "serial")
+    assert external_id(42) == 42
+
+    monkeypatch.setattr(ids.settings, "ID_STRATEGY", "snowflake")
+    assert external_id(2 ** 60) == str(2 ** 60)
+    assert external_id(None) is None
@@ -0,0 +1,53 @@
+import pytest
+
+from src.config import get_settings
+from src.models.user import AuthProvider, User
+from src.services.email import EmailService
+from src.utils.security import get_password_hash
+
+settings = get_settings()
+
+
+@pytest.fixture
+def sent_links(monkeypatch):
+    sent = []
+
+    async def send_magic_link_email(email, link, purpose):
+        sent.append((email, link, purpose))
+        return True
+
+    monkeypatch.setattr(settings, "MAGIC_LINK_FLOWS", "password_reset")
+    monkeypatch.setattr(EmailService, "send_magic_link_email", send_magic_link_email)
+    return sent
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="reset@example.com",
+        hashed_password=get_password_hash("old-password"),
+        auth_provider=AuthProvider.LOCAL,
+        is_active=True,
+        is_verified=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_repeated_forgot_password_sends_one_magic_link(client, user, sent_links):
+    for _ in range(5):
+        response = client.post("/api/v1/auth/forgot-password", json={"email": "reset@example.com"})
+        assert response.json()["header"]["responseCode"] == 200
+
+    assert len(sent_links) == 1
+    assert sent_links[0][0] == "reset@example.com"
+
+
+def test_magic_link_can_be_resent_after_cooldown(client, user, sent_links, monkeypatch):
+    monkeypatch.setattr(settings, "OTP_RESEND_COOLDOWN_SECONDS", 0)
+
+    client.post("/api/v1/auth/forgot-password", json={"email": "reset@example.com"})
+    client.post("/api/v1/auth/forgot-password", json={"email": "reset@example.com"})
+
+    assert len(sent_links) == 2
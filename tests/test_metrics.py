@@ -0,0 +1,19 @@
+from src.config import get_settings
+
+settings = get_settings()
+
+
+def test_metrics_are_hidden_without_admin_key_configured(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", None)
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_require_the_admin_key(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-key")
+
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", headers={"X-Admin-Key": "wrong"}).status_code == 403
+
+    response = client.get("/metrics", headers={"X-Admin-Key": "admin-key"})
+    assert response.status_code == 200
+    assert "counters" in response.json()["body"]
@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from src.models.user import OTP
+from src.services import otp_store
+from src.services.otp_store import InMemoryKV, KVOTPStore, SQLOTPStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_in_memory_kv_expires_keys(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(otp_store.time, "monotonic", clock.monotonic)
+    kv = InMemoryKV()
+
+    kv.set("a", "1", ex=10)
+    kv.set("b", "2", ex=30)
+    clock.now += 20
+
+    assert kv.get("a") is None
+    assert kv.get("b") == "2"
+
+
+def test_in_memory_kv_purges_expired_keys_on_set(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(otp_store.time, "monotonic", clock.monotonic)
+    kv = InMemoryKV()
+
+    for i in range(100):
+        kv.set(f"otp:{i}", "code", ex=10)
+    clock.now += 11
+    kv.set("fresh", "code", ex=10)
+
+    assert list(kv._data) == ["fresh"]
+
+
+def test_overwritten_key_keeps_its_latest_expiry(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(otp_store.time, "monotonic", clock.monotonic)
+    kv = InMemoryKV()
+
+    kv.set("otp", "old", ex=10)
+    clock.now += 5
+    kv.set("otp", "new", ex=60)
+    clock.now += 10
+    kv.set("other", "x", ex=60)
+
+    assert kv.get("otp") == "new"
+
+
+def test_in_memory_kv_set_nx_only_writes_missing_keys(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(otp_store.time, "monotonic", clock.monotonic)
+    kv = InMemoryKV()
+
+    assert kv.set("cooldown", "1", ex=10, nx=True)
+    assert not kv.set("cooldown", "2", ex=10, nx=True)
+    clock.now += 11
+    assert kv.set("cooldown", "3", ex=10, nx=True)
+    assert kv.get("cooldown") == "3"
+
+
+def test_concurrent_kv_send_claims_admit_exactly_one():
+    store = KVOTPStore(InMemoryKV())
+    barrier = threading.Barrier(8)
+
+    def claim(_):
+        barrier.wait()
+        return store.claim_send(None, "race@example.com", "password_reset", 60)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(claim, range(8)))
+
+    assert results.count(True) == 1
+
+
+def test_sql_send_claim_respects_the_cooldown(db):
+    store = SQLOTPStore()
+    email, otp_type = "claim@example.com", "email_verification"
+
+    assert store.claim_send(db, email, otp_type, 60)
+    store.issue(db, email, otp_type, "123456", 600)
+    assert not store.claim_send(db, email, otp_type, 60)
+
+    db.query(OTP).filter(OTP.email == email).update(
+        {OTP.last_sent_at: datetime.utcnow() - timedelta(seconds=61)}
+    )
+    db.commit()
+
+    assert store.claim_send(db, email, otp_type, 60)
+    db.commit()
+    assert not store.claim_send(db, email, otp_type, 60)
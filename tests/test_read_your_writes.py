@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+import src.database as database
+from src.database import READ_AFTER_COOKIE, READ_AFTER_HEADER, ReadSessions, SessionLocal
+from src.models.user import AuthProvider, User
+from src.utils.security import get_password_hash
+
+
+class HealthyReplica:
+    def is_healthy(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica_factory = object()
+    monkeypatch.setattr(database, "ReplicaSessionLocal", replica_factory)
+    monkeypatch.setattr(database, "replica_monitor", HealthyReplica())
+    return replica_factory
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="writer@example.com",
+        hashed_password=get_password_hash("password123"),
+        auth_provider=AuthProvider.LOCAL,
+        is_active=True,
+        is_verified=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def read_factory(read_after=None):
+    marker = database.WriteMarker(database.parse_read_after(read_after))
+    token = database.write_marker_var.set(marker)
+    try:
+        return ReadSessions().factory()
+    finally:
+        database.write_marker_var.reset(token)
+
+
+def test_reads_use_the_replica_without_a_marker(replica):
+    assert read_factory() is replica
+
+
+def test_client_marker_routes_reads_to_the_primary_until_it_expires(replica):
+    assert read_factory(str(time.time() + 5)) is SessionLocal
+    assert read_factory(str(time.time() - 1)) is replica
+
+
+def test_forged_long_lived_marker_is_ignored(replica):
+    assert read_factory(str(time.time() + 86400)) is replica
+    assert read_factory("not-a-timestamp") is replica
+
+
+def test_writes_hand_the_client_a_read_after_marker(client, user):
+    login = client.post("/api/v1/auth/login", json={"email": "writer@example.com", "password": "password123"})
+    token = login.json()["body"]["access_token"]
+
+    response = client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+    read_after = float(response.headers[READ_AFTER_HEADER])
+    assert time.time() < read_after <= time.time() + database.settings.REPLICA_READ_YOUR_WRITES_SECONDS
+    assert response.cookies[READ_AFTER_COOKIE] == response.headers[READ_AFTER_HEADER]
+    assert READ_AFTER_HEADER not in client.get("/health").headers
@@ -0,0 +1,32 @@
+import pytest
+
+from src.models.user import AuthProvider, RefreshToken, User
+from src.utils.security import get_password_hash
+
+CREDENTIALS = {"email": "devices@example.com", "password": "password123"}
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email=CREDENTIALS["email"],
+        hashed_password=get_password_hash(CREDENTIALS["password"]),
+        auth_provider=AuthProvider.LOCAL,
+        is_active=True,
+        is_verified=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_logins_in_the_same_second_get_separate_sessions(client, user, db):
+    first = client.post("/api/v1/auth/login", json=CREDENTIALS, headers={"User-Agent": "laptop"})
+    second = client.post("/api/v1/auth/login", json=CREDENTIALS, headers={"User-Agent": "phone"})
+
+    assert first.json()["header"]["responseCode"] == 200
+    assert second.json()["header"]["responseCode"] == 200
+    assert first.json()["body"]["refresh_token"] != second.json()["body"]["refresh_token"]
+
+    sessions = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).all()
+    assert sorted(session.user_agent for session in sessions) == ["laptop", "phone"]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "user"
+
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+        return results, calls, flight.in_flight()
+
+    results, calls, in_flight = asyncio.run(scenario())
+    assert results == ["user"] * 5
+    assert len(calls) == 1
+    assert in_flight == 0
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "user"
+
+        leader = asyncio.ensure_future(flight.do("key", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do("key", load))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leader, await waiter
+
+    leader, result = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert result == "user"
+
+
+def test_exceptions_reach_every_caller_and_are_not_cached():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise LookupError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+        async def succeed():
+            return "ok"
+
+        return results, await flight.do("key", succeed)
+
+    results, retry = asyncio.run(scenario())
+    assert all(isinstance(result, LookupError) for result in results)
+    assert retry == "ok"
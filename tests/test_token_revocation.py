@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from src.models.user import AuthProvider, User
+from src.services.revocation_feed import _apply_to_tokens
+from src.utils.security import get_password_hash, revoked_tokens
+from src.utils.token_cache import RevokedTokens
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="session@example.com",
+        hashed_password=get_password_hash("password123"),
+        auth_provider=AuthProvider.LOCAL,
+        is_active=True,
+        is_verified=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def login(client) -> str:
+    response = client.post("/api/v1/auth/login", json={"email": "session@example.com", "password": "password123"})
+    return response.json()["body"]["access_token"]
+
+
+def me(client, token: str) -> int:
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+    return response.status_code
+
+
+def test_access_token_is_rejected_after_logout(client, user):
+    token = login(client)
+    assert me(client, token) == 200
+
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    assert me(client, token) == 401
+
+
+def test_logout_all_revokes_every_session_but_not_later_logins(client, user):
+    first, second = login(client), login(client)
+    assert me(client, first) == 200 and me(client, second) == 200
+
+    client.post("/api/v1/auth/logout-all", headers={"Authorization": f"Bearer {first}"})
+    assert me(client, first) == 401
+    assert me(client, second) == 401
+
+    assert me(client, login(client)) == 200
+
+
+def test_single_session_revocation_leaves_other_sessions(client, user):
+    first, second = login(client), login(client)
+
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {first}"})
+    assert me(client, first) == 401
+    assert me(client, second) == 200
+
+
+def test_revocation_events_from_other_workers_are_applied(monkeypatch):
+    tokens = RevokedTokens(1800)
+    monkeypatch.setattr("src.services.revocation_feed.revoked_tokens", tokens)
+    now = time.time()
+
+    _apply_to_tokens([
+        {"user_id": 1, "session_id": 10, "timestamp": "2026-10-19T12:00:00+00:00"},
+        {"user_id": "2", "session_id": None, "timestamp": None},
+    ])
+
+    assert tokens.is_revoked({"sub": "1", "sid": 10, "iat": now})
+    assert not tokens.is_revoked({"sub": "1", "sid": 11, "iat": now})
+    assert tokens.is_revoked({"sub": "2", "sid": 5, "iat": now - 1})
+    assert not tokens.is_revoked({"sub": "2", "sid": 5, "iat": now + 1})
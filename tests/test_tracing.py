@@ -0,0 +1,37 @@
+import pytest
+
+from src.utils import tracing
+from src.utils.tracing import InMemorySpanExporter, span
+
+
+@pytest.fixture
+def exporter_setting(monkeypatch):
+    def configure(exporter: str):
+        monkeypatch.setattr(tracing.settings, "TRACING_EXPORTER", exporter)
+        tracing.get_exporter.cache_clear()
+        tracing.tracing_active.cache_clear()
+
+    yield configure
+    tracing.get_exporter.cache_clear()
+    tracing.tracing_active.cache_clear()
+
+
+def test_no_spans_are_built_without_an_exporter(exporter_setting):
+    exporter_setting("none")
+
+    with span("http.request", trace_id="trace-1") as root:
+        assert root is None
+        assert tracing.current_span.get() is None
+
+
+def test_spans_nest_under_the_request_trace(exporter_setting):
+    exporter_setting("memory")
+
+    with span("http.request", trace_id="trace-1"):
+        with span("db.query"):
+            pass
+
+    exported = tracing.get_exporter().get_trace("trace-1")
+    assert isinstance(tracing.get_exporter(), InMemorySpanExporter)
+    assert [item["name"] for item in exported] == ["db.query", "http.request"]
+    assert exported[0]["parent_id"] == exported[1]["span_id"]
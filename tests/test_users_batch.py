@@ -0,0 +1,53 @@
+import pytest
+
+from src.models.user import AuthProvider, User
+from src.services.user_directory import user_directory
+from src.utils.security import create_service_token
+
+
+@pytest.fixture(autouse=True)
+def empty_directory():
+    user_directory._profiles.clear()
+    user_directory._ids_by_email.clear()
+
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(email=f"user{i}@example.com", auth_provider=AuthProvider.LOCAL, is_active=True, is_verified=True)
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def batch(client, scopes, payload):
+    token = create_service_token("svc_test", scopes)
+    return client.post("/api/v1/users/batch", json=payload, headers={"Authorization": f"Bearer {token}"})
+
+
+def test_batch_lookup_requires_users_read_scope(client, users):
+    response = batch(client, ["revocations:read"], {"ids": [users[0].id]})
+    assert response.status_code == 403
+
+
+def test_batch_lookup_resolves_ids_and_emails_and_reports_misses(client, users):
+    response = batch(client, ["users:read"], {
+        "ids": [users[0].id, 999999],
+        "emails": ["USER1@example.com", "missing@example.com"],
+    })
+
+    body = response.json()["body"]
+    assert sorted(profile["email"] for profile in body["users"]) == ["user0@example.com", "user1@example.com"]
+    assert body["missing"] == {"ids": [999999], "emails": ["missing@example.com"]}
+
+
+def test_batch_lookup_rejects_oversized_requests(client, users):
+    response = batch(client, ["users:read"], {"ids": list(range(1, 502))})
+    assert response.json()["header"]["responseCode"] == 422
+
+
+def test_batch_lookup_rejects_empty_requests(client, users):
+    response = batch(client, ["users:read"], {})
+    assert response.json()["header"]["responseCode"] == 422